@@ -1,17 +1,35 @@
 import random
-from collections import deque
+from grid import DIRECTIONS, FloodFill
 
 class AIController:
-    def __init__(self, snake, food, screen_width, screen_height, cell_size):
+    def __init__(self, snake, food, bounds=None, board_occupancy=None, planner=None, rng=None):
         self.snake = snake
         self.food = food
-        self.screen_width = screen_width
-        self.screen_height = screen_height
-        self.cell_size = cell_size
+        self.grid = snake.grid
+        self.flood_fill = FloodFill(self.grid)
+        # Optional per-cell segment counts of every snake on the board
+        # (grid.CellOwners.counts), so moves onto other snakes score lower
+        self.board_occupancy = board_occupancy
+        # Optional path planner (see planner.py) asked before the greedy scoring
+        self.planner = planner
+        # random.Random for the last-resort move; pass a seeded one for repeatable games
+        self.rng = rng or random.Random()
+        # Rectangle of cells (left, top, right, bottom) the AI must stay inside
+        self.bounds = None
+        self.set_bounds(bounds or (0, 0, self.grid.cols, self.grid.rows))
+        
+    def set_bounds(self, bounds):
+        """Restrict the AI to a rectangle of cells"""
+        if bounds != self.bounds:
+            self.bounds = bounds
+            self.inside = self.grid.mask(bounds)
         
     def get_next_direction(self):
         """Smart AI strategy"""
-        head = self.snake.get_head()
+        # Follow the planner's cached path when it has one
+        planned = self.get_planned_direction()
+        if planned is not None:
+            return planned
         
         # First check all safe moves
         safe_moves = self.get_safe_moves()
@@ -24,30 +42,44 @@ class AIController:
         best_move = self.choose_best_safe_move(safe_moves)
         return best_move
     
+    def get_planned_direction(self):
+        """Next step from the planner, None without a planner or a usable plan"""
+        if self.planner is None:
+            return None
+        return self.planner.next_direction(self)
+    
     def get_safe_moves(self):
         """Get all safe movement directions"""
+        candidates = [direction for direction in DIRECTIONS if self.is_move_possible(direction)]
         head = self.snake.get_head()
-        safe_moves = []
+        cells = [self.grid.neighbors[direction][head] for direction in candidates]
         
-        for direction in [(0, -1), (0, 1), (-1, 0), (1, 0)]:  # Up, down, left, right
-            if self.is_move_safe(direction):
-                safe_moves.append(direction)
+        # One labelling pass answers the dead-end check for every candidate;
+        # neighbours in the same free region share a single flood fill
+        needed = len(self.snake)
+        spaces = self.flood_fill.component_sizes(cells, self.snake.occupancy.cells, self.inside, needed + 5)
         
-        return safe_moves
+        return [direction for direction, space in zip(candidates, spaces) if space >= needed]
     
     def is_move_safe(self, direction):
         """Check if move is safe (won't die immediately and has enough space)"""
-        head = self.snake.get_head()
-        new_x = head[0] + direction[0] * self.cell_size
-        new_y = head[1] + direction[1] * self.cell_size
+        if not self.is_move_possible(direction):
+            return False
+        
+        # Check if this move leads to dead end
+        new_head = self.grid.neighbors[direction][self.snake.get_head()]
+        return self.has_escape_route(new_head, direction)
+    
+    def is_move_possible(self, direction):
+        """Check if move won't die on the next step"""
+        new_head = self.grid.neighbors[direction][self.snake.get_head()]
         
         # Check boundaries
-        if (new_x < 0 or new_x >= self.screen_width or 
-            new_y < 0 or new_y >= self.screen_height):
+        if new_head < 0 or not self.inside[new_head]:
             return False
         
         # Check collision with body
-        if (new_x, new_y) in self.snake.body:
+        if self.snake.occupies(new_head):
             return False
         
         # Check if opposite to current direction
@@ -55,60 +87,44 @@ class AIController:
         if direction == (-current_dir[0], -current_dir[1]):
             return False
         
-        # Check if this move leads to dead end
-        return self.has_escape_route((new_x, new_y), direction)
+        return True
     
     def has_escape_route(self, position, direction):
         """Check if there's an escape route from this position"""
-        # Use BFS to check if there's enough space
-        visited = set()
-        queue = deque([position])
-        visited.add(position)
-        space_count = 0
-        
-        while queue and space_count < len(self.snake.body) + 5:  # Need at least snake length + 5 space
-            current = queue.popleft()
-            space_count += 1
-            
-            for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-                next_x = current[0] + dx * self.cell_size
-                next_y = current[1] + dy * self.cell_size
-                next_pos = (next_x, next_y)
-                
-                if (0 <= next_x < self.screen_width and 
-                    0 <= next_y < self.screen_height and
-                    next_pos not in self.snake.body and
-                    next_pos not in visited):
-                    visited.add(next_pos)
-                    queue.append(next_pos)
-        
-        return space_count >= len(self.snake.body)
+        # Need at least snake length + 5 space
+        return self.reachable_space(position, len(self.snake) + 5) >= len(self.snake)
+    
+    def reachable_space(self, position, limit):
+        """Count free cells reachable from position, up to limit"""
+        return self.flood_fill.count(position, self.snake.occupancy.cells, self.inside, limit)
     
     def choose_best_safe_move(self, safe_moves):
         """Choose best among safe moves"""
-        head = self.snake.get_head()
-        food_pos = self.food.position
+        left, top, right, bottom = self.bounds
+        # With no food on the board every move scores the same on distance
+        food_pos = self.food.position if self.food.position is not None else self.snake.get_head()
+        food_x, food_y = self.grid.coords(food_pos)
+        board_occupancy = self.board_occupancy
         
         # Calculate score for each safe move
         move_scores = []
         
         for direction in safe_moves:
-            new_x = head[0] + direction[0] * self.cell_size
-            new_y = head[1] + direction[1] * self.cell_size
+            new_head = self.grid.neighbors[direction][self.snake.get_head()]
+            new_x, new_y = self.grid.coords(new_head)
             
             # Calculate distance to food (negative because we want minimum distance)
-            food_distance = -(abs(new_x - food_pos[0]) + abs(new_y - food_pos[1]))
+            food_distance = -(abs(new_x - food_x) + abs(new_y - food_y))
             
             # Calculate distance to borders (positive because we want to stay away from borders)
-            border_distance = min(new_x, new_y, 
-                                self.screen_width - new_x - self.cell_size,
-                                self.screen_height - new_y - self.cell_size)
+            border_distance = min(new_x - left, new_y - top, 
+                                right - new_x - 1,
+                                bottom - new_y - 1)
             
-            # Calculate nearest distance to snake body
-            min_body_distance = float('inf')
-            for body_part in self.snake.body:
-                dist = abs(new_x - body_part[0]) + abs(new_y - body_part[1])
-                min_body_distance = min(min_body_distance, dist)
+            # Distance to the nearest snake body. The head is next to every
+            # candidate and a safe move never enters this snake's own body, so
+            # it is always 1, or 0 where another snake covers the cell
+            min_body_distance = 0 if board_occupancy is not None and board_occupancy[new_head] else 1
             
             # Combined score
             score = food_distance * 0.7 + border_distance * 0.2 + min_body_distance * 0.1
@@ -124,7 +140,7 @@ class AIController:
         current_dir = self.snake.direction
         
         # At least don't reverse
-        possible_moves = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+        possible_moves = list(DIRECTIONS)
         reverse_dir = (-current_dir[0], -current_dir[1])
         
         if reverse_dir in possible_moves:
@@ -132,12 +148,10 @@ class AIController:
         
         # Among remaining moves, choose one that won't immediately hit wall
         for direction in possible_moves:
-            new_x = head[0] + direction[0] * self.cell_size
-            new_y = head[1] + direction[1] * self.cell_size
+            new_head = self.grid.neighbors[direction][head]
             
-            if (0 <= new_x < self.screen_width and 
-                0 <= new_y < self.screen_height):
+            if new_head >= 0 and self.inside[new_head]:
                 return direction
         
         # If all will hit wall, randomly choose one
-        return random.choice(possible_moves) if possible_moves else (1, 0)
\ No newline at end of file
+        return self.rng.choice(possible_moves) if possible_moves else (1, 0)
\ No newline at end of file
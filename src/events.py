@@ -0,0 +1,84 @@
+import atexit
+import json
+import time
+from collections import deque
+
+# Event log for the simulations and views, replacing their print calls.
+# Each event is a dict with the time, level and kind of the event plus its
+# own fields (tick, snake, cell, ...), so a log can be read back as JSON
+# lines and analysed. The last `capacity` events stay in memory (events)
+# whether or not they are also written to a file; file writes are batched,
+# flush_every events at a time.
+#
+# The log is off by default. Callers on hot paths check the level before
+# building an event, so a disabled log costs one comparison:
+#
+#     if log.level <= DEBUG:
+#         log.debug("food_spawned", cell=grid.coords(cell))
+
+DEBUG = 10
+INFO = 20
+OFF = 100
+
+LEVELS = {"debug": DEBUG, "info": INFO, "off": OFF}
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info"}
+
+class EventLog:
+    """Leveled ring buffer of events, optionally written to a JSON lines file"""
+
+    def __init__(self, level=OFF, capacity=10000, path=None, flush_every=1000):
+        self.file = None
+        self.configure(level, capacity, path, flush_every)
+        atexit.register(self.close)
+
+    def configure(self, level=OFF, capacity=10000, path=None, flush_every=1000):
+        """Set what gets logged and where; events logged so far are flushed first"""
+        self.close()
+        self.level = level
+        self.events = deque(maxlen=capacity)
+        self.flush_every = flush_every
+        self.pending = []  # Events not yet written to the file
+        self.start = time.perf_counter()
+        if path:
+            self.file = open(path, "a", encoding="utf-8")
+
+    def log(self, level, kind, **fields):
+        if level < self.level:
+            return
+
+        event = {"t": round(time.perf_counter() - self.start, 4), "level": LEVEL_NAMES[level],
+                 "event": kind}
+        event.update(fields)
+        self.events.append(event)
+
+        if self.file:
+            self.pending.append(event)
+            if len(self.pending) >= self.flush_every:
+                self.flush()
+
+    def debug(self, kind, **fields):
+        self.log(DEBUG, kind, **fields)
+
+    def info(self, kind, **fields):
+        self.log(INFO, kind, **fields)
+
+    def flush(self):
+        """Write pending events to the file in one go"""
+        if self.file and self.pending:
+            self.file.write("".join(json.dumps(event) + "\n" for event in self.pending))
+            self.file.flush()
+        self.pending = []
+
+    def close(self):
+        self.flush()
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def dump(self, path):
+        """Write the events still held in memory to path as JSON lines"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(event) + "\n" for event in self.events))
+
+
+log = EventLog()
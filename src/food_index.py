@@ -0,0 +1,101 @@
+# Up to this many foods, checking each one beats walking the buckets
+# (measured on a 60x35 board; a battle royale rarely has more than 8)
+SCAN_LIMIT = 64
+
+class FoodTarget:
+    """The food an AIController is heading for; reused, only position changes"""
+
+    __slots__ = ('position',)
+
+    def __init__(self, position=None):
+        self.position = position
+
+
+class FoodIndex:
+    """Food cells bucketed by board region for fast nearest-food queries
+
+    Behaves like the old list of food cells (iteration in spawn order, len,
+    in, remove) while nearest() only looks at buckets close to the query,
+    once there are more than SCAN_LIMIT foods.
+    """
+
+    def __init__(self, grid, bucket_size=8):
+        self.grid = grid
+        self.bucket_size = bucket_size
+        self.bucket_cols = -(-grid.cols // bucket_size)
+        self.bucket_rows = -(-grid.rows // bucket_size)
+        self.clear()
+
+    def clear(self):
+        # cell -> spawn sequence, kept in spawn order; ties in nearest()
+        # go to the earliest spawn like min() over a list did
+        self.foods = {}
+        self.sequence = 0
+        self.buckets = [{} for _ in range(self.bucket_cols * self.bucket_rows)]
+
+    def bucket(self, cell):
+        x, y = self.grid.coords(cell)
+        return (y // self.bucket_size) * self.bucket_cols + x // self.bucket_size
+
+    def add(self, cell):
+        if cell in self.foods:
+            return
+        self.sequence += 1
+        self.foods[cell] = self.sequence
+        self.buckets[self.bucket(cell)][cell] = self.sequence
+
+    def remove(self, cell):
+        del self.foods[cell]
+        del self.buckets[self.bucket(cell)][cell]
+
+    def __contains__(self, cell):
+        return cell in self.foods
+
+    def __iter__(self):
+        return iter(list(self.foods))
+
+    def __len__(self):
+        return len(self.foods)
+
+    def nearest(self, cell):
+        """Closest food to cell by Manhattan distance, None when there is none"""
+        if not self.foods:
+            return None
+
+        x, y = self.grid.coords(cell)
+        cols = self.grid.cols
+        if len(self.foods) <= SCAN_LIMIT:
+            # In spawn order, so ties keep going to the earliest spawn
+            best = None
+            best_distance = None
+            for food in self.foods:
+                distance = abs(food % cols - x) + abs(food // cols - y)
+                if best is None or distance < best_distance:
+                    best, best_distance = food, distance
+            return best
+
+        size = self.bucket_size
+        bucket_x, bucket_y = x // size, y // size
+        best = None
+        best_key = None
+
+        # Walk square rings of buckets outwards. Every cell in ring r is at
+        # least (r - 1) * size + 1 away, so stop once that beats the best
+        for ring in range(max(self.bucket_cols, self.bucket_rows)):
+            if best is not None and best_key[0] < (ring - 1) * size + 1:
+                break
+
+            for by in range(bucket_y - ring, bucket_y + ring + 1):
+                if not 0 <= by < self.bucket_rows:
+                    continue
+                on_edge = by in (bucket_y - ring, bucket_y + ring)
+                step = 1 if on_edge else 2 * ring
+                for bx in range(bucket_x - ring, bucket_x + ring + 1, max(1, step)):
+                    if not 0 <= bx < self.bucket_cols:
+                        continue
+                    for food, sequence in self.buckets[by * self.bucket_cols + bx].items():
+                        key = (abs(food % cols - x) + abs(food // cols - y), sequence)
+                        if best_key is None or key < best_key:
+                            best, best_key = food, key
+
+        return best
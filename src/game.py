@@ -1,14 +1,16 @@
-import pygame
 import random
-from snake import Snake
-from ai_controller import AIController
+import pygame
+from simulation import SingleSimulation
+from renderer import Renderer
+from game_loop import FixedTimestepLoop
+from utils import get_font, render_text, overlay_surface
+from replay import recorder
+from events import log, DEBUG
 
 class Game:
-    def __init__(self, screen, ai_mode=False):
+    def __init__(self, screen, ai_mode=False, turbo=False, seed=None, replay_dir=None):
         self.screen = screen
-        self.clock = pygame.time.Clock()
         self.running = True
-        self.game_over = False
         self.ai_mode = ai_mode
         
         # Game settings
@@ -17,65 +19,51 @@ class Game:
         self.cell_size = 20
         
         # Fonts
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
-        self.large_font = pygame.font.Font(None, 72)
-        
-        # Initialize game objects
-        start_x = (self.width // 2 // self.cell_size) * self.cell_size
-        start_y = (self.height // 2 // self.cell_size) * self.cell_size
-        self.snake = Snake(start_x, start_y, self.cell_size)
-        
-        self.score = 0
-        self.game_start_time = pygame.time.get_ticks()
-        
-        # Generate food
-        self.food_pos = self.generate_food()
-        
-        # AI controller
-        if self.ai_mode:
-            # Create temporary food object for AI use
-            self.temp_food = type('Food', (), {'position': self.food_pos})()
-            self.ai_controller = AIController(self.snake, self.temp_food, self.width, self.height, self.cell_size)
-        
-        print(f"Game initialized - Snake at: {(start_x, start_y)}, Food at: {self.food_pos}")
-        
-    def generate_food(self):
-        """Generate food position, ensuring it's not on the snake body"""
-        max_attempts = 100
-        attempts = 0
-        
-        while attempts < max_attempts:
-            x = random.randint(0, (self.width // self.cell_size) - 1) * self.cell_size
-            y = random.randint(0, (self.height // self.cell_size) - 1) * self.cell_size
-            food_pos = (x, y)
-            
-            # Ensure food is not on snake body
-            if food_pos not in self.snake.body:
-                print(f"Food generated at: {food_pos}")
-                return food_pos
-                
-            attempts += 1
-        
-        # If no suitable position found, return a safe position
-        return (self.cell_size, self.cell_size)
+        self.font = get_font(36)
+        self.small_font = get_font(24)
+        self.large_font = get_font(72)
+        
+        # Game state lives in the headless simulation, this class only draws it.
+        # Each game gets its own seed from the session's, so a seed makes the
+        # whole session repeatable and every game can be replayed on its own
+        self.seeds = random.Random(seed)
+        self.replay_dir = replay_dir
+        self.options = dict(cols=self.width // self.cell_size, rows=self.height // self.cell_size, ai_mode=ai_mode)
+        game_seed = self.seeds.getrandbits(32)
+        self.sim = SingleSimulation(**self.options, rng=random.Random(game_seed))
+        
+        # Only cells and text that changed get repainted each frame
+        self.renderer = Renderer(screen)
+        self.board = self.renderer.add_board(self.sim.grid.cols, self.sim.grid.rows, self.cell_size)
+        self.result_drawn = False
+        
+        # Direction the player pressed for each action key, handed to the
+        # simulation as an action on that snake's next move
+        self.actions = {}
+        
+        # Turbo mode (AI only) plays game after game as fast as possible;
+        # final scores are kept so a run of games can be compared
+        self.loop = FixedTimestepLoop(self)
+        self.loop.set_turbo(turbo and ai_mode)
+        self.finished_scores = []
+        self.start_recording(game_seed)
+        
+    @property
+    def game_over(self):
+        return self.sim.game_over
             
     def run(self):
-        print(f"Starting {'AI' if self.ai_mode else 'Manual'} game...")
-        
-        while self.running:
-            self.handle_events()
-            if not self.game_over:
-                self.update()
-            self.draw()
-            self.clock.tick(10)  # 10 FPS
+        # Simulation ticks at sim.tick_ms however fast frames are drawn
+        self.loop.run()
             
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
-                if self.game_over:
+                if event.key == pygame.K_t and self.ai_mode:
+                    self.loop.set_turbo(not self.loop.turbo)
+                elif self.game_over:
                     if event.key == pygame.K_r:
                         self.restart_game()
                     elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
@@ -83,7 +71,8 @@ class Game:
                 else:
                     # Only respond to keyboard control in manual mode
                     if not self.ai_mode:
-                        current_dir = self.snake.direction
+                        snake = self.sim.snake
+                        current_dir = snake.direction
                         new_dir = None
                         
                         if event.key == pygame.K_UP or event.key == pygame.K_w:
@@ -97,113 +86,83 @@ class Game:
                         
                         # Prevent reverse movement
                         if new_dir and new_dir != (-current_dir[0], -current_dir[1]):
-                            self.snake.change_direction(new_dir[0], new_dir[1])
-                            print(f"Direction changed to: {new_dir}")
-                            
-    def update(self):
-        # AI control
-        if self.ai_mode:
-            # Update AI food target
-            self.temp_food.position = self.food_pos
-            direction = self.ai_controller.get_next_direction()
-            self.snake.change_direction(direction[0], direction[1])
-        
-        # Move snake
-        self.snake.move()
-        
-        # Check food collision
-        head = self.snake.get_head()
-        if head == self.food_pos:
-            print(f"Food eaten! Snake head: {head}, Food position: {self.food_pos}")
-            self.snake.grow()
-            self.score += 10
-            self.food_pos = self.generate_food()
-            print(f"Score: {self.score}, Snake length: {len(self.snake.body)}")
-        
-        # Check boundary collision
-        if (head[0] < 0 or head[0] >= self.width or 
-            head[1] < 0 or head[1] >= self.height):
-            print("Snake hit boundary!")
-            self.end_game()
-            
-        # Check self collision
-        if self.snake.check_collision():
-            print("Snake hit itself!")
-            self.end_game()
-            
-    def end_game(self):
-        """End the game"""
-        self.game_over = True
-        print(f"Game Over! Final score: {self.score}")
+                            self.actions[0] = new_dir
+                            if log.level <= DEBUG:
+                                log.debug("direction_changed", tick=self.sim.ticks, direction=new_dir)
         
     def draw(self):
-        self.screen.fill((0, 0, 0))
-        
         if not self.game_over:
             self.draw_game()
-        else:
+            self.renderer.present()
+        elif not self.result_drawn:
+            # The result screen is static, so it is drawn once
+            self.screen.fill((0, 0, 0))
             self.draw_result_screen()
-            
-        pygame.display.flip()
+            pygame.display.flip()
+            self.result_drawn = True
+            self.renderer.invalidate()
         
     def draw_game(self):
-        """Draw game screen"""
-        # Draw snake
-        self.snake.draw(self.screen)
-        
-        # Draw food
-        self.draw_food(self.food_pos)
+        """Update the board and HUD; the renderer repaints whatever changed"""
+        snake = self.sim.snake
+        renderer = self.renderer
         
-        # Draw score and info
-        score_text = self.font.render(f"Score: {self.score}", True, (255, 255, 255))
-        self.screen.blit(score_text, (10, 10))
+        # Snake and food
+        self.board.track(0, snake)
+        self.board.set_foods([self.sim.food_pos])
         
-        length_text = self.small_font.render(f"Length: {len(self.snake.body)}", True, (255, 255, 255))
-        self.screen.blit(length_text, (10, 50))
+        # Score and info
+        renderer.label("score", f"Score: {self.sim.score}", self.font, (255, 255, 255), topleft=(10, 10))
+        renderer.label("length", f"Length: {len(snake)}", self.small_font, (255, 255, 255), topleft=(10, 50))
         
         # Show mode
-        mode_text = self.small_font.render(f"Mode: {'AI' if self.ai_mode else 'Manual'}", True, (150, 150, 150))
-        self.screen.blit(mode_text, (10, 75))
+        renderer.label("mode", f"Mode: {'AI' if self.ai_mode else 'Manual'}", self.small_font, (150, 150, 150),
+                       topleft=(10, 75))
         
         # Control instructions (manual mode only)
         if not self.ai_mode:
-            controls = self.small_font.render("WASD/Arrow Keys to move", True, (100, 100, 100))
-            self.screen.blit(controls, (10, 100))
-            
-    def draw_food(self, food_pos):
-        """Draw food"""
-        rect = pygame.Rect(food_pos[0], food_pos[1], self.cell_size, self.cell_size)
-        pygame.draw.rect(self.screen, (255, 0, 0), rect)  # Red food
-        pygame.draw.rect(self.screen, (255, 255, 255), rect, 1)  # White border
+            renderer.label("controls", "WASD/Arrow Keys to move", self.small_font, (100, 100, 100),
+                           topleft=(10, 100))
+        else:
+            renderer.label("controls", "T to toggle turbo", self.small_font, (100, 100, 100), topleft=(10, 100))
+        
+        # Results of the games finished so far, mostly useful in turbo mode
+        scores = self.finished_scores
+        if scores:
+            renderer.label("games", f"Games: {len(scores)}  Best: {max(scores)}  "
+                           f"Average: {sum(scores) / len(scores):.1f}", self.small_font, (150, 150, 150),
+                           topleft=(10, 125))
+        if self.loop.turbo:
+            renderer.label("turbo", "TURBO", self.font, (255, 255, 0), topright=(self.width - 10, 10))
+        else:
+            renderer.remove("turbo")
         
     def draw_result_screen(self):
         """Draw result screen"""
         # Semi-transparent background
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.set_alpha(150)
-        overlay.fill((0, 0, 0))
+        overlay = overlay_surface((self.width, self.height), (0, 0, 0), 150)
         self.screen.blit(overlay, (0, 0))
         
         # Game time
-        game_time = (pygame.time.get_ticks() - self.game_start_time) // 1000
+        game_time = self.sim.elapsed_ms // 1000
         minutes = game_time // 60
         seconds = game_time % 60
         
         # Title
-        title_text = self.large_font.render("GAME OVER", True, (255, 0, 0))
+        title_text = render_text(self.large_font, "GAME OVER", (255, 0, 0))
         title_rect = title_text.get_rect(center=(self.width // 2, self.height // 2 - 100))
         self.screen.blit(title_text, title_rect)
         
         # Statistics
         stats = [
-            f"Final Score: {self.score}",
-            f"Snake Length: {len(self.snake.body)}",
+            f"Final Score: {self.sim.score}",
+            f"Snake Length: {len(self.sim.snake)}",
             f"Survival Time: {minutes:02d}:{seconds:02d}",
             f"Mode: {'AI' if self.ai_mode else 'Manual'}"
         ]
         
         for i, stat in enumerate(stats):
-            stat_text = self.font.render(stat, True, (255, 255, 255))
+            stat_text = render_text(self.font, stat, (255, 255, 255))
             stat_rect = stat_text.get_rect(center=(self.width // 2, self.height // 2 - 20 + i * 40))
             self.screen.blit(stat_text, stat_rect)
         
@@ -214,28 +173,24 @@ class Game:
         ]
         
         for i, control in enumerate(controls):
-            control_text = self.small_font.render(control, True, (150, 150, 150))
+            control_text = render_text(self.small_font, control, (150, 150, 150))
             control_rect = control_text.get_rect(center=(self.width // 2, self.height // 2 + 120 + i * 25))
             self.screen.blit(control_text, control_rect)
         
+    def start_recording(self, game_seed):
+        """Record the game just started; games started in turbo mode are not saved"""
+        # Turbo plays thousands of games a minute and each would be its own file
+        replay_dir = None if self.loop.turbo else self.replay_dir
+        self.replay = recorder("single", self.options, game_seed, replay_dir)
+        
     def restart_game(self):
         """Restart the game"""
-        print("Restarting game...")
-        self.game_over = False
-        self.score = 0
-        self.game_start_time = pygame.time.get_ticks()
-        
-        # Reset snake position
-        start_x = (self.width // 2 // self.cell_size) * self.cell_size
-        start_y = (self.height // 2 // self.cell_size) * self.cell_size
-        self.snake = Snake(start_x, start_y, self.cell_size)
-        
-        # Regenerate food
-        self.food_pos = self.generate_food()
-        
-        # Reinitialize AI controller
-        if self.ai_mode:
-            self.temp_food = type('Food', (), {'position': self.food_pos})()
-            self.ai_controller = AIController(self.snake, self.temp_food, self.width, self.height, self.cell_size)
-        
-        print("Game restarted!")
\ No newline at end of file
+        if self.game_over:
+            self.finished_scores.append(self.sim.score)
+        game_seed = self.seeds.getrandbits(32)
+        self.sim.rng.seed(game_seed)
+        self.sim.reset()
+        self.start_recording(game_seed)
+        self.actions = {}
+        self.renderer.clear()
+        self.result_drawn = False
\ No newline at end of file
@@ -0,0 +1,70 @@
+import time
+import pygame
+
+# Fixed-timestep loop shared by the game views. The simulation advances in
+# whole ticks of sim.tick_ms at its own rate however long a frame takes to
+# draw, and drawing is capped separately. The board is drawn in whole cells,
+# so frames between two ticks just show the last tick; with the dirty-rect
+# renderer those frames cost next to nothing.
+
+FRAME_RATE = 60      # Most frames drawn per second
+MAX_CATCH_UP_MS = 250  # Longest stall made up for in one frame
+TURBO_FRAME_MS = 100   # Wall time spent simulating between frames in turbo mode
+
+class FixedTimestepLoop:
+    """Steps a view's simulation at its own tick rate, independent of the frame rate"""
+
+    def __init__(self, view, frame_rate=FRAME_RATE):
+        self.view = view
+        self.frame_rate = frame_rate
+        self.clock = pygame.time.Clock()
+        self.accumulator = 0
+        
+        # Turbo runs ticks back to back as fast as the CPU allows and only
+        # draws a sample frame every TURBO_FRAME_MS of wall time
+        self.turbo = False
+
+    def set_turbo(self, turbo):
+        self.turbo = turbo
+        self.accumulator = 0
+        self.clock.tick()
+
+    def run(self):
+        view = self.view
+        self.clock.tick()  # Don't count the time before the loop started
+        while view.running:
+            view.handle_events()
+            if self.turbo:
+                self.fast_forward()
+            else:
+                self.advance(self.clock.tick(self.frame_rate))
+            view.draw()
+
+    def step(self):
+        """One simulation tick with the player's input, recorded into the view's replay"""
+        view = self.view
+        # A pressed direction waits for its snake's next move; in battle
+        # royale a snake only moves every few frames
+        actions = {key: view.actions.pop(key) for key, _ in view.sim.moving_snakes() if key in view.actions}
+        view.replay.step(view.sim, actions)
+
+    def advance(self, elapsed_ms):
+        """Run every simulation tick that fits into the time elapsed so far"""
+        sim = self.view.sim
+        # After a long stall (window dragged, debugger) skip ahead instead of
+        # running a burst of ticks the player could not react to
+        self.accumulator += min(elapsed_ms, MAX_CATCH_UP_MS)
+        while self.accumulator >= sim.tick_ms:
+            self.accumulator -= sim.tick_ms
+            if not self.view.game_over:
+                self.step()
+
+    def fast_forward(self):
+        """Run ticks back to back for one turbo frame, starting a new game whenever one ends"""
+        view = self.view
+        deadline = time.perf_counter() + TURBO_FRAME_MS / 1000
+        while time.perf_counter() < deadline:
+            self.step()
+            if view.game_over:
+                view.restart_game()
+        self.clock.tick()
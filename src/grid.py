@@ -0,0 +1,273 @@
+from array import array
+from itertools import compress
+
+# Up, down, left, right, in the order the AI has always tried them
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+class Grid:
+    """Board geometry in cells; a cell is packed into one int as y * cols + x"""
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.size = cols * rows
+        self.masks = {}  # bounds -> mask, shared by everything on this board
+
+        # neighbors[direction][cell] is the cell one step away, or -1 when that
+        # step leaves the board, so moving never needs coordinates
+        self.neighbors = {}
+        for dx, dy in DIRECTIONS:
+            table = array('i', [-1]) * self.size
+            for y in range(rows):
+                for x in range(cols):
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < cols and 0 <= ny < rows:
+                        table[y * cols + x] = ny * cols + nx
+            self.neighbors[(dx, dy)] = table
+
+    def cell(self, x, y):
+        """Packed cell for column x and row y, -1 when it is off the board"""
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return y * self.cols + x
+        return -1
+
+    def coords(self, cell):
+        """Column and row of a packed cell"""
+        y, x = divmod(cell, self.cols)
+        return x, y
+
+    def direction(self, cell, next_cell):
+        """Direction of the step between two neighbouring cells"""
+        for direction, table in self.neighbors.items():
+            if table[cell] == next_cell:
+                return direction
+        return None
+
+    def mask(self, bounds):
+        """Bytearray with 1 for every cell inside bounds (left, top, right, bottom)"""
+        if bounds not in self.masks:
+            left, top, right, bottom = bounds
+            mask = bytearray(self.size)
+            for y in range(top, bottom):
+                mask[y * self.cols + left:y * self.cols + right] = b'\x01' * (right - left)
+            self.masks[bounds] = mask
+        return self.masks[bounds]
+
+
+class OccupancyGrid:
+    """Per-cell occupancy counts for a board"""
+
+    def __init__(self, grid, free_cells=None, owners=None):
+        self.grid = grid
+        # One byte per cell holding how many body segments cover it; a count
+        # above one means a head has just run into a body
+        self.cells = bytearray(grid.size)
+        # Board-wide FreeCells and CellOwners told about every segment added
+        # and removed
+        self.free_cells = free_cells
+        self.owners = owners
+        self.owner = owners.register(self) if owners is not None else -1
+
+    def add(self, cell):
+        if cell >= 0:
+            self.cells[cell] += 1
+            if self.free_cells is not None:
+                self.free_cells.occupy(cell)
+            if self.owners is not None:
+                self.owners.add(cell, self.owner)
+
+    def remove(self, cell):
+        if cell >= 0 and self.cells[cell]:
+            self.cells[cell] -= 1
+            if self.free_cells is not None:
+                self.free_cells.vacate(cell)
+            if self.owners is not None:
+                self.owners.remove(cell, self.owner)
+
+    def detach(self):
+        """Take every segment off the board-wide grids, e.g. when the snake dies"""
+        cells = self.cells
+        self.cells = bytearray(self.grid.size)
+        # Only the few cells the snake covers, found without a Python-level
+        # pass over the whole board
+        for cell in compress(range(len(cells)), cells):
+            for _ in range(cells[cell]):
+                if self.free_cells is not None:
+                    self.free_cells.vacate(cell)
+                if self.owners is not None:
+                    self.owners.remove(cell, self.owner)
+        self.free_cells = None
+        self.owners = None
+
+    def count(self, cell):
+        return self.cells[cell] if cell >= 0 else 0
+
+    def is_occupied(self, cell):
+        return cell >= 0 and self.cells[cell] > 0
+
+    def clear(self):
+        self.cells = bytearray(self.grid.size)
+
+
+class CellOwners:
+    """Which snake covers each cell of a board, for O(1) snake-vs-snake checks
+
+    Each snake's OccupancyGrid registers here and reports its segments, so
+    owner(cell) is one array lookup instead of asking every snake. A cell
+    keeps the snake that covered it first: a head moving onto another
+    snake's body still finds that snake as the owner. Cells covered by two
+    snakes at once are rare (snakes spawning on the same cell), so only then
+    is the new owner searched for when the recorded one leaves.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.owners = array('h', [-1]) * grid.size
+        self.counts = bytearray(grid.size)  # Segments of all snakes on each cell
+        self.occupancies = []  # Registered OccupancyGrids by owner id
+
+    def register(self, occupancy):
+        """Owner id for a new snake's OccupancyGrid"""
+        self.occupancies.append(occupancy)
+        return len(self.occupancies) - 1
+
+    def add(self, cell, owner):
+        self.counts[cell] += 1
+        if self.owners[cell] < 0:
+            self.owners[cell] = owner
+
+    def remove(self, cell, owner):
+        self.counts[cell] -= 1
+        if not self.counts[cell]:
+            self.owners[cell] = -1
+        elif self.owners[cell] == owner and not self.occupancies[owner].cells[cell]:
+            # Shared cell left by its recorded owner; hand it to whoever is still there
+            for other, occupancy in enumerate(self.occupancies):
+                if occupancy.cells[cell] and occupancy.owners is self:
+                    self.owners[cell] = other
+                    break
+
+    def owner(self, cell):
+        """Id of the snake covering cell, -1 when none does"""
+        return self.owners[cell] if cell >= 0 else -1
+
+
+class FreeCells:
+    """Cells inside an area that nothing occupies, for O(1) random picks
+
+    Snakes (through their OccupancyGrid) and food occupy cells; a cell is
+    free while its count is zero. The free cells are kept in a dense list
+    with each cell's position in it, so a cell is added by appending and
+    removed by moving the last cell into its slot. A uniformly random free
+    cell is then one randrange, however full the board is.
+    """
+
+    def __init__(self, grid, inside=None):
+        self.grid = grid
+        self.counts = bytearray(grid.size)
+        if inside is None:
+            inside = grid.mask((0, 0, grid.cols, grid.rows))
+        self.set_inside(inside)
+
+    def set_inside(self, inside):
+        """Only hand out cells of the inside mask, e.g. after the safe zone shrank"""
+        self.inside = inside
+        self.cells = [cell for cell in range(self.grid.size) if inside[cell] and not self.counts[cell]]
+        self.index = array('i', [-1]) * self.grid.size
+        for position, cell in enumerate(self.cells):
+            self.index[cell] = position
+
+    def occupy(self, cell):
+        self.counts[cell] += 1
+        position = self.index[cell]
+        if position >= 0:
+            last = self.cells.pop()
+            if last != cell:
+                self.cells[position] = last
+                self.index[last] = position
+            self.index[cell] = -1
+
+    def vacate(self, cell):
+        self.counts[cell] -= 1
+        if not self.counts[cell] and self.inside[cell]:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.index[cell] >= 0
+
+    def choice(self, rng):
+        """Uniformly random free cell, None when there is none"""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class FloodFill:
+    """Bounded BFS over a Grid that reuses the same buffers on every call"""
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.tables = list(grid.neighbors.values())
+        # A cell counts as visited when its stamp equals the current
+        # generation, so starting a new fill is one increment, not a clear
+        self.stamps = [0] * grid.size
+        self.generation = 0
+        self.queue = [0] * grid.size
+
+    def count(self, start, blocked, inside, limit):
+        """Number of cells reachable from start, stopping once limit is reached
+
+        blocked and inside are per-cell byte masks: a cell can be entered
+        when it is inside and not blocked.
+        """
+        self.generation += 1
+        generation = self.generation
+        stamps = self.stamps
+        queue = self.queue
+        tables = self.tables
+
+        stamps[start] = generation
+        queue[0] = start
+        head, tail = 0, 1
+        count = 0
+
+        while head < tail and count < limit:
+            current = queue[head]
+            head += 1
+            count += 1
+
+            for table in tables:
+                next_cell = table[current]
+                if (next_cell >= 0 and inside[next_cell] and
+                        not blocked[next_cell] and stamps[next_cell] != generation):
+                    stamps[next_cell] = generation
+                    queue[tail] = next_cell
+                    tail += 1
+
+        return count
+
+    def component_sizes(self, starts, blocked, inside, limit):
+        """count() for several start cells, labelling free regions as it goes
+
+        Every fill leaves its generation on the cells it reached, so a later
+        start inside an already labelled region reuses that fill's count
+        instead of searching again. A count equal to limit means the region
+        is at least that big.
+        """
+        first_label = self.generation + 1
+        sizes = {}
+        result = []
+
+        for start in starts:
+            label = self.stamps[start]
+            if label < first_label:
+                size = self.count(start, blocked, inside, limit)
+                label = self.generation
+                sizes[label] = size
+            result.append(sizes[label])
+
+        return result
@@ -1,9 +1,16 @@
+import time
+# --profile-startup 用的计时点, 从导入之前开始
+startup_marks = [("start", time.perf_counter())]
+
 import pygame
+startup_marks.append(("import pygame", time.perf_counter()))
 import sys
 import os
-from game import Game
-from dual_game import DualGame
-from battle_royale import BattleRoyaleGame
+import argparse
+from utils import get_font
+from events import log, LEVELS
+# 游戏模式 (以及 AI) 在选中时才导入, 菜单不用等它们加载
+startup_marks.append(("import utils, events", time.perf_counter()))
 
 class LanguageManager:
     def __init__(self):
@@ -32,31 +39,45 @@ class LanguageManager:
         # 国旗位置和大小
         self.flag_rect = pygame.Rect(20, 20, 60, 40)
         
+        # 每种语言的字体文件只查找一次, None 表示默认字体
+        self.font_paths = {
+            "en": None,
+            "zh": self.find_font([
+                "C:/Windows/Fonts/simhei.ttf",      # 黑体
+                "C:/Windows/Fonts/msyh.ttc",        # 微软雅黑
+                "C:/Windows/Fonts/simsun.ttc",      # 宋体
+            ])
+        }
+        
+        # 每种语言渲染好的菜单画面, 语言 -> Surface
+        self.menus = {}
+        
     def get_text(self, key):
         return self.texts[self.current_language].get(key, key)
     
     def toggle_language(self):
         self.current_language = "zh" if self.current_language == "en" else "en"
     
+    def find_font(self, font_paths):
+        """返回第一个存在的字体文件, 都不存在时返回 None (默认字体)"""
+        for font_path in font_paths:
+            if os.path.exists(font_path):
+                return font_path
+        return None
+    
     def get_font(self, size):
         """根据当前语言获取合适的字体"""
-        if self.current_language == "zh":
-            # 中文字体
-            font_paths = [
-                "C:/Windows/Fonts/simhei.ttf",      # 黑体
-                "C:/Windows/Fonts/msyh.ttc",        # 微软雅黑
-                "C:/Windows/Fonts/simsun.ttc",      # 宋体
-            ]
-            
-            for font_path in font_paths:
-                try:
-                    if os.path.exists(font_path):
-                        return pygame.font.Font(font_path, size)
-                except:
-                    continue
-        
-        # 英文字体或中文字体加载失败时使用默认字体
-        return pygame.font.Font(None, size)
+        # 字体按 (路径, 大小) 缓存, 每种大小第一次使用时才加载
+        # 中文字体加载失败时使用默认字体
+        return get_font(size, self.font_paths[self.current_language])
+    
+    def menu_surface(self, size):
+        """当前语言的菜单画面, 第一次使用时才绘制"""
+        menu = self.menus.get(self.current_language)
+        if menu is None or menu.get_size() != size:
+            menu = self.menus[self.current_language] = pygame.Surface(size)
+            draw_menu(menu, self)
+        return menu
     
     def draw_flag(self, screen):
         """绘制国旗"""
@@ -106,18 +127,14 @@ class LanguageManager:
         # 绘制边框
         pygame.draw.rect(screen, (0, 0, 0), self.flag_rect, 2)
     
+    # 单位五角星的顶点, 从顶部开始, 只计算一次
+    STAR_POINTS = [pygame.math.Vector2(1, 0).rotate(i * 72 - 90) for i in range(5)]
+    
     def draw_star(self, screen, center, size, color):
         """绘制五角星"""
         # 简化的星星绘制
-        points = []
-        for i in range(5):
-            angle = i * 72 - 90  # 从顶部开始
-            x = center[0] + size * pygame.math.Vector2(1, 0).rotate(angle).x
-            y = center[1] + size * pygame.math.Vector2(1, 0).rotate(angle).y
-            points.append((x, y))
-        
-        if len(points) >= 3:
-            pygame.draw.polygon(screen, color, points)
+        points = [(center[0] + size * p.x, center[1] + size * p.y) for p in self.STAR_POINTS]
+        pygame.draw.polygon(screen, color, points)
     
     def handle_click(self, pos):
         """处理点击事件"""
@@ -126,91 +143,168 @@ class LanguageManager:
             return True
         return False
 
+def draw_menu(surface, lang_manager):
+    """把菜单画到 surface 上"""
+    surface.fill((0, 0, 0))
+    
+    # 绘制国旗
+    lang_manager.draw_flag(surface)
+    
+    # 绘制语言提示
+    hint_font = lang_manager.get_font(18)
+    hint_text = hint_font.render(lang_manager.get_text("click_flag"), True, (150, 150, 150))
+    surface.blit(hint_text, (100, 30))
+    
+    # 标题
+    title_font = lang_manager.get_font(48)
+    title = title_font.render(lang_manager.get_text("title"), True, (255, 255, 255))
+    title_rect = title.get_rect(center=(surface.get_width() // 2, 120))
+    surface.blit(title, title_rect)
+    
+    # 模式选项
+    option_font = lang_manager.get_font(28)
+    options = [
+        lang_manager.get_text("single_ai"),
+        lang_manager.get_text("single_manual"),
+        lang_manager.get_text("dual_mode"),
+        lang_manager.get_text("battle_royale"),
+        lang_manager.get_text("quit")
+    ]
+    
+    for i, option in enumerate(options):
+        color = (255, 255, 0) if i == 3 else (200, 200, 200)  # 大逃杀模式高亮
+        option_text = option_font.render(option, True, color)
+        option_rect = option_text.get_rect(center=(surface.get_width() // 2, 200 + i * 45))
+        surface.blit(option_text, option_rect)
+
 def show_menu(screen, lang_manager):
     """显示游戏模式选择菜单"""
+    # 菜单是静态的: 每种语言只画一次并缓存, 之后只需 blit
+    # 阻塞在 event.wait() 上, 只有画面变化时才 flip, 空闲时几乎不占 CPU
+    redraw = True
     
     while True:
-        screen.fill((0, 0, 0))
-        
-        # 绘制国旗
-        lang_manager.draw_flag(screen)
-        
-        # 绘制语言提示
-        hint_font = lang_manager.get_font(18)
-        hint_text = hint_font.render(lang_manager.get_text("click_flag"), True, (150, 150, 150))
-        screen.blit(hint_text, (100, 30))
-        
-        # 标题
-        title_font = lang_manager.get_font(48)
-        title = title_font.render(lang_manager.get_text("title"), True, (255, 255, 255))
-        title_rect = title.get_rect(center=(screen.get_width() // 2, 120))
-        screen.blit(title, title_rect)
-        
-        # 模式选项
-        option_font = lang_manager.get_font(28)
-        options = [
-            lang_manager.get_text("single_ai"),
-            lang_manager.get_text("single_manual"),
-            lang_manager.get_text("dual_mode"),
-            lang_manager.get_text("battle_royale"),
-            lang_manager.get_text("quit")
-        ]
-        
-        for i, option in enumerate(options):
-            color = (255, 255, 0) if i == 3 else (200, 200, 200)  # 大逃杀模式高亮
-            option_text = option_font.render(option, True, color)
-            option_rect = option_text.get_rect(center=(screen.get_width() // 2, 200 + i * 45))
-            screen.blit(option_text, option_rect)
+        if redraw:
+            screen.blit(lang_manager.menu_surface(screen.get_size()), (0, 0))
+            pygame.display.flip()
+            redraw = False
         
-        pygame.display.flip()
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            return None
+        elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+            # 窗口被遮挡后恢复, 需要重新显示
+            redraw = True
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:  # 左键点击
+                if lang_manager.handle_click(event.pos):
+                    # 语言切换后重新绘制
+                    redraw = True
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_1:
+                return "single_ai"
+            elif event.key == pygame.K_2:
+                return "single_manual"
+            elif event.key == pygame.K_3:
+                return "dual"
+            elif event.key == pygame.K_4:
+                return "battle_royale"
+            elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
                 return None
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # 左键点击
-                    if lang_manager.handle_click(event.pos):
-                        # 语言切换后重新绘制
-                        continue
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_1:
-                    return "single_ai"
-                elif event.key == pygame.K_2:
-                    return "single_manual"
-                elif event.key == pygame.K_3:
-                    return "dual"
-                elif event.key == pygame.K_4:
-                    return "battle_royale"
-                elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
-                    return None
+
+class StartupProfile:
+    """记录启动各阶段的耗时, 启用时打印报告"""
+    
+    def __init__(self, enabled, marks):
+        self.enabled = enabled
+        self.marks = marks  # [(阶段名, 结束时间)], 第一个是起点
+        self.reported = 1
+    
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter()))
+    
+    def restart(self):
+        """从现在开始计时, 之前的时间 (菜单, 游戏) 不计入"""
+        self.marks = [("start", time.perf_counter())]
+        self.reported = 1
+    
+    def report(self):
+        """打印上次报告之后的各阶段耗时"""
+        if not self.enabled:
+            return
+        for i in range(self.reported, len(self.marks)):
+            label, end = self.marks[i]
+            print(f"{label:<24}{(end - self.marks[i - 1][1]) * 1000:8.1f} ms")
+        print(f"{'total':<24}{(self.marks[-1][1] - self.marks[self.reported - 1][1]) * 1000:8.1f} ms")
+        self.reported = len(self.marks)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Snake Game - Multi Mode")
+    parser.add_argument("--turbo", action="store_true",
+                        help="run AI single-player games as fast as possible (toggle in game with T)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed the game's random numbers so every run plays out the same")
+    parser.add_argument("--record", metavar="DIR", default=None,
+                        help="save a replay of every finished game into DIR, except games "
+                             "started in turbo mode (watch with src/replay.py)")
+    parser.add_argument("--log", metavar="FILE", default=None,
+                        help="append game events to FILE as JSON lines")
+    parser.add_argument("--log-level", choices=["info", "debug"], default="info",
+                        help="debug also logs food spawns and key presses (default: info)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each import and init step takes until the menu appears")
+    return parser.parse_args()
 
 def main():
-    pygame.init()
+    args = parse_args()
+    profile = StartupProfile(args.profile_startup, startup_marks)
+    if args.log:
+        log.configure(LEVELS[args.log_level], path=args.log)
+    profile.mark("parse args")
+    
+    # 只初始化用到的模块 (显示和字体), 不初始化音频等
+    pygame.display.init()
+    profile.mark("pygame.display.init")
+    pygame.font.init()
+    profile.mark("pygame.font.init")
     
     # 创建游戏屏幕
     screen = pygame.display.set_mode((1200, 700))  # 加大屏幕以适应大逃杀模式
     pygame.display.set_caption("Snake Game - Multi Mode")
+    profile.mark("set_mode")
     
     # 创建语言管理器
     lang_manager = LanguageManager()
+    lang_manager.menu_surface(screen.get_size())
+    profile.mark("render menu")
+    profile.report()
     
     while True:
         mode = show_menu(screen, lang_manager)
+        profile.restart()
         
         if mode is None:
             break
         elif mode == "single_ai":
-            game = Game(screen, ai_mode=True)
-            game.run()
+            from game import Game
+            profile.mark("import game")
+            game = Game(screen, ai_mode=True, turbo=args.turbo, seed=args.seed, replay_dir=args.record)
         elif mode == "single_manual":
-            game = Game(screen, ai_mode=False)
-            game.run()
+            from game import Game
+            profile.mark("import game")
+            game = Game(screen, ai_mode=False, seed=args.seed, replay_dir=args.record)
         elif mode == "dual":
-            dual_game = DualGame(screen)
-            dual_game.run()
+            from dual_game import DualGame
+            profile.mark("import dual_game")
+            game = DualGame(screen, seed=args.seed, replay_dir=args.record)
         elif mode == "battle_royale":
-            battle_royale = BattleRoyaleGame(screen)
-            battle_royale.run()
+            from battle_royale import BattleRoyaleGame
+            profile.mark("import battle_royale")
+            game = BattleRoyaleGame(screen, seed=args.seed, replay_dir=args.record)
+        
+        profile.mark(f"start {mode}")
+        profile.report()
+        game.run()
     
     pygame.quit()
     sys.exit()
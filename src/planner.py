@@ -0,0 +1,211 @@
+import heapq
+from collections import deque
+
+# Path planners an AIController can consult before its greedy one-step
+# scoring. next_direction() returns a direction, or None to let the greedy
+# logic decide this tick.
+
+class AStarPlanner:
+    """Shortest path to the food, reused until it is blocked or the food moves"""
+
+    def __init__(self):
+        self.path = deque()  # (cell, direction) steps still to take
+        self.target = None
+        self.expected_head = None
+
+    def next_direction(self, controller):
+        snake = controller.snake
+        food = controller.food.position
+        if food is None:
+            return None
+
+        head = snake.get_head()
+        if food != self.target or head != self.expected_head or not self.path:
+            self.plan(controller)
+
+        if self.path:
+            cell, direction = self.path[0]
+            if not controller.inside[cell] or snake.occupies(cell):
+                # Blocked since it was planned (e.g. the safe zone shrank)
+                self.plan(controller)
+
+        if not self.path:
+            return None
+
+        cell, direction = self.path.popleft()
+        self.expected_head = cell
+        return direction
+
+    def plan(self, controller):
+        """Search a fresh path from the snake's head to its food"""
+        self.path.clear()
+        self.target = controller.food.position
+        path = self.search(controller)
+
+        # Only follow the path if its first step does not walk into a dead end
+        if path and controller.is_move_safe(path[0][1]):
+            self.path.extend(path)
+
+    def search(self, controller):
+        grid = controller.grid
+        snake = controller.snake
+        inside = controller.inside
+        start = snake.get_head()
+        goal = self.target
+        goal_x, goal_y = grid.coords(goal)
+        cols = grid.cols
+
+        # The snake cannot reverse, so the cell behind the head is closed too
+        dx, dy = snake.direction
+        behind = grid.neighbors[(-dx, -dy)][start]
+
+        came_from = {start: None}
+        cost = {start: 0}
+        frontier = [(0, 0, start)]
+        tie = 0
+
+        while frontier:
+            _, _, current = heapq.heappop(frontier)
+            if current == goal:
+                break
+
+            for direction, table in grid.neighbors.items():
+                next_cell = table[current]
+                if (next_cell < 0 or not inside[next_cell] or snake.occupies(next_cell) or
+                        (current == start and next_cell == behind)):
+                    continue
+
+                new_cost = cost[current] + 1
+                if new_cost < cost.get(next_cell, new_cost + 1):
+                    cost[next_cell] = new_cost
+                    came_from[next_cell] = (current, direction)
+                    estimate = abs(next_cell % cols - goal_x) + abs(next_cell // cols - goal_y)
+                    tie += 1
+                    heapq.heappush(frontier, (new_cost + estimate, tie, next_cell))
+
+        if goal not in came_from:
+            return None
+
+        path = []
+        cell = goal
+        while came_from[cell] is not None:
+            previous, direction = came_from[cell]
+            path.append((cell, direction))
+            cell = previous
+        path.reverse()
+        return path
+
+
+class HamiltonianPlanner:
+    """Follow a fixed cycle through every cell of the bounds
+
+    Slow to reach food but never traps itself once the body lies along the
+    cycle. A rectangle with both sides odd has no cycle through every cell,
+    so there the cycle leaves out the bottom-left corner; on that one cell
+    the planner defers to the greedy logic.
+    """
+
+    def __init__(self):
+        self.bounds = None
+        self.successor = {}
+
+    def next_direction(self, controller):
+        if controller.bounds != self.bounds:
+            self.bounds = controller.bounds
+            self.successor = self.build_cycle(controller.grid, controller.bounds)
+
+        next_cell = self.successor.get(controller.snake.get_head())
+        if next_cell is None:
+            return None
+
+        direction = controller.grid.direction(controller.snake.get_head(), next_cell)
+        # Until the body has lined up along the cycle the next cell may still be taken
+        if not controller.is_move_possible(direction):
+            return None
+        return direction
+
+    def build_cycle(self, grid, bounds):
+        """Map each cell of bounds to the next cell on a Hamiltonian cycle"""
+        left, top, right, bottom = bounds
+        width, height = right - left, bottom - top
+        if width < 2 or height < 2:
+            return {}
+
+        # Zig-zag along rows over every column but the first, which is kept
+        # free for the way back; needs an even number of rows, so transpose
+        # when only the width is even
+        if height % 2 == 0:
+            order = self.zigzag(width, height)
+        elif width % 2 == 0:
+            order = [(y, x) for x, y in self.zigzag(height, width)]
+        else:
+            order = self.zigzag_odd(width, height)
+
+        cells = [grid.cell(left + x, top + y) for x, y in order]
+        return {cell: cells[(i + 1) % len(cells)] for i, cell in enumerate(cells)}
+
+    def zigzag(self, width, height):
+        order = []
+        for y in range(height):
+            xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+            order.extend((x, y) for x in xs)
+        order.extend((0, y) for y in range(height - 1, -1, -1))
+        return order
+
+    def zigzag_odd(self, width, height):
+        """zigzag() for both sides odd: the last row is folded into the one above, minus its first cell
+
+        The second-to-last row runs right to left; each pair of its columns
+        dips into the last row and back, which covers every cell of the last
+        row except column 0.
+        """
+        order = self.zigzag(width, height - 1)
+        fold = height - 2
+        start = order.index((width - 1, fold))
+        dips = []
+        for x in range(width - 1, 0, -2):
+            dips += [(x, fold), (x, fold + 1), (x - 1, fold + 1), (x - 1, fold)]
+        order[start:start + width - 1] = dips
+        return order
+
+
+class HybridPlanner:
+    """A* while the snake is short, the Hamiltonian cycle once it is long enough to trap itself
+
+    The switch is for good and comes at whichever happens first: the snake
+    reaching long_fraction of the bounds (A* snakes box themselves in at
+    about 5-6% of a 60x35 board), or A* finding no path to the food whose
+    first step still leaves the snake room, a sign the body is walling the
+    head in.
+    """
+
+    def __init__(self, long_fraction=0.05):
+        self.long_fraction = long_fraction
+        self.astar = AStarPlanner()
+        self.hamiltonian = HamiltonianPlanner()
+        self.on_cycle = False
+
+    def next_direction(self, controller):
+        if not self.on_cycle:
+            left, top, right, bottom = controller.bounds
+            if len(controller.snake) >= self.long_fraction * (right - left) * (bottom - top):
+                self.on_cycle = True
+            else:
+                direction = self.astar.next_direction(controller)
+                if direction is not None or controller.food.position is None:
+                    return direction
+                self.on_cycle = True
+        return self.hamiltonian.next_direction(controller)
+
+
+PLANNERS = {
+    "greedy": None,
+    "astar": AStarPlanner,
+    "hamiltonian": HamiltonianPlanner,
+    "hybrid": HybridPlanner,
+}
+
+def make_planner(name):
+    """New planner instance for a name in PLANNERS (None for plain greedy)"""
+    planner_class = PLANNERS[name]
+    return planner_class() if planner_class else None
@@ -0,0 +1,203 @@
+from collections import deque
+import pygame
+from utils import cell_rect, block_tile, render_text
+
+# Dirty-rectangle drawing for the game views. Instead of clearing the screen
+# and drawing every snake segment each frame, the views tell the Renderer what
+# the board and HUD should look like; it works out which cells and text
+# regions changed, repaints only those and hands their rects to
+# pygame.display.update.
+
+class Board:
+    """One grid of cells drawn at an offset on the screen"""
+
+    def __init__(self, cols, rows, block_size, offset=(0, 0), food_color=(255, 0, 0)):
+        self.cols = cols
+        self.block_size = block_size
+        self.offset = offset
+        self.food_color = food_color
+        self.rect = pygame.Rect(offset, (cols * block_size, rows * block_size))
+        self.size = cols * rows
+        self.clear()
+
+    def clear(self):
+        """Forget everything drawn on this board"""
+        self.colors = [None] * self.size  # snake color painted in each cell
+        self.foods = set()
+        self.trails = {}  # key -> [snake, color, its moves, cells drawn for it, head first]
+        self.vacated = []
+        self.entered = []
+        self.changed = set()
+
+    def track(self, key, snake):
+        """Follow a snake from where it was last drawn"""
+        body = snake.body
+        length = len(body)
+        trail = self.trails.get(key)
+        if trail is None or trail[0] is not snake or trail[1] != snake.color:
+            # New or replaced snake, redraw it from scratch
+            self.untrack(key)
+            trail = self.trails[key] = [snake, snake.color, snake.moves, deque()]
+            new = length
+        else:
+            # Each move added one cell at the head, so the cells drawn last
+            # time are now body[new:], shortened at the tail
+            new = min(snake.moves - trail[2], length)
+            trail[2] = snake.moves
+
+        drawn = trail[3]
+        if new == length:
+            self.vacated.extend(drawn)
+            drawn.clear()
+        for i in range(new - 1, -1, -1):
+            drawn.appendleft(body[i])
+            self.entered.append((body[i], snake.color))
+
+        while len(drawn) > length:
+            self.vacated.append(drawn.pop())
+
+    def untrack(self, key):
+        """Erase a snake that is no longer drawn"""
+        trail = self.trails.pop(key, None)
+        if trail is not None:
+            self.vacated.extend(trail[3])
+
+    def set_foods(self, cells):
+        cells = set(cells)
+        self.changed.update(cells.symmetric_difference(self.foods))
+        self.foods = cells
+
+    def apply(self):
+        """Fold the snake moves queued since the last frame into the cell colors"""
+        # Erase first so a cell one snake left and another entered ends up painted
+        for cell in self.vacated:
+            self.colors[cell] = None
+        for cell, color in self.entered:
+            self.colors[cell] = color
+        self.changed.update(self.vacated)
+        self.changed.update(cell for cell, _ in self.entered)
+        self.vacated = []
+        self.entered = []
+
+    def dirty_rects(self):
+        rects = [self.cell_rect(cell) for cell in self.changed]
+        self.changed.clear()
+        return rects
+
+    def cell_rect(self, cell):
+        return cell_rect(cell, self.cols, self.block_size).move(self.offset)
+
+    def draw(self, surface, area):
+        """Paint the cells of this board that overlap area"""
+        area = area.clip(self.rect)
+        if not area:
+            return
+
+        left, top = self.offset
+        size = self.block_size
+        colors = self.colors
+        blocks = []
+        for y in range((area.top - top) // size, (area.bottom - 1 - top) // size + 1):
+            for x in range((area.left - left) // size, (area.right - 1 - left) // size + 1):
+                cell = y * self.cols + x
+                color = colors[cell]
+                if color is None and cell in self.foods:
+                    color = self.food_color
+                if color is not None:
+                    blocks.append((block_tile(color, size), (left + x * size, top + y * size)))
+
+        # One batched call with pre-rendered tiles instead of two rect draws per cell
+        surface.blits(blocks, False)
+
+
+class Renderer:
+    """Redraws only the parts of the screen that changed since the last frame"""
+
+    def __init__(self, screen, background_color=(0, 0, 0)):
+        self.screen = screen
+        # Everything under the boards and HUD (zones, dividers); the views
+        # paint into it and call invalidate() when they do
+        self.background = pygame.Surface(screen.get_size())
+        self.background.fill(background_color)
+        self.boards = []
+        self.overlays = {}  # key -> (state, rect, draw function)
+        self.dirty = []
+        self.full = True
+
+    def add_board(self, cols, rows, block_size, offset=(0, 0)):
+        board = Board(cols, rows, block_size, offset)
+        self.boards.append(board)
+        return board
+
+    def invalidate(self):
+        """Repaint the whole screen on the next present()"""
+        self.full = True
+
+    def clear(self):
+        """Start over with empty boards and no HUD, e.g. after a restart"""
+        for board in self.boards:
+            board.clear()
+        self.overlays.clear()
+        self.invalidate()
+
+    def label(self, key, text, font, color, **position):
+        """Show text at a position given as a pygame.Rect keyword (topleft=, center=)"""
+        state = (text, font, color, tuple(position.items()))
+        entry = self.overlays.get(key)
+        if entry is not None and entry[0] == state:
+            return
+
+        surface = render_text(font, text, color)
+        rect = surface.get_rect(**position)
+        self.set_overlay(key, state, rect, lambda screen: screen.blit(surface, rect))
+
+    def circle(self, key, color, center, radius, width=0):
+        state = (color, center, radius, width)
+        entry = self.overlays.get(key)
+        if entry is not None and entry[0] == state:
+            return
+
+        rect = pygame.Rect(center[0] - radius - 1, center[1] - radius - 1, 2 * radius + 2, 2 * radius + 2)
+        self.set_overlay(key, state, rect,
+                         lambda screen: pygame.draw.circle(screen, color, center, radius, width))
+
+    def set_overlay(self, key, state, rect, draw):
+        self.remove(key)
+        self.overlays[key] = (state, rect, draw)
+        self.dirty.append(rect)
+
+    def remove(self, key):
+        """Take a label or circle off the screen"""
+        entry = self.overlays.pop(key, None)
+        if entry is not None:
+            self.dirty.append(entry[1])
+
+    def present(self):
+        """Repaint what changed and push just those rects to the display"""
+        for board in self.boards:
+            board.apply()
+            self.dirty.extend(board.dirty_rects())
+
+        if self.full:
+            self.full = False
+            self.dirty = []
+            self.repaint(self.screen.get_rect())
+            pygame.display.flip()
+            return
+
+        for rect in self.dirty:
+            self.repaint(rect)
+        pygame.display.update(self.dirty)
+        self.dirty = []
+
+    def repaint(self, rect):
+        """Rebuild one region from the background up: cells, then overlays"""
+        screen = self.screen
+        screen.set_clip(rect)
+        screen.blit(self.background, rect, rect)
+        for board in self.boards:
+            board.draw(screen, rect)
+        for _, overlay_rect, draw in self.overlays.values():
+            if overlay_rect.colliderect(rect):
+                draw(screen)
+        screen.set_clip(None)
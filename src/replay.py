@@ -0,0 +1,241 @@
+import copy
+import json
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from grid import DIRECTIONS
+from simulation import SingleSimulation, DualSimulation, BattleRoyaleSimulation
+
+# Game replays. A game is fully determined by how its simulation was set up,
+# the seed of its rng and the direction each snake moved in each tick, so
+# that is all a replay stores: a small JSON header, then the moves packed
+# four to a byte (2 bits each, an index into DIRECTIONS) and zlib-compressed.
+# Only snakes that actually move in a tick are recorded; the simulation tells
+# the writer and the player which ones those are (moving_snakes()), so the
+# stream needs no per-tick framing. A 10-minute battle royale is a few KB.
+#
+# Playback re-simulates with the recorded moves as actions, so the AI never
+# runs. The player snapshots the simulation every KEYFRAME_INTERVAL ticks on
+# the way and seeks by restoring the nearest snapshot before the target.
+#
+#     python src/replay.py game.snkr    # watch a replay
+
+MAGIC = b"SNKR"
+# Moves only replay correctly on the simulation that recorded them, so bump
+# this whenever a change makes the same seed and moves play out differently
+# (food spawning, move timing, how actions are applied, defaults of
+# simulation options). Files of any other version are refused rather than
+# replayed wrong. src/replay_check.py checks that recording and playback
+# still agree.
+VERSION = 3
+KEYFRAME_INTERVAL = 300  # Ticks between snapshots; 10 seconds of battle royale
+
+SIMULATIONS = {
+    "single": SingleSimulation,
+    "dual": DualSimulation,
+    "battle_royale": BattleRoyaleSimulation,
+}
+
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+class ReplayWriter:
+    """Records a game while it is played, saving it to path when it ends"""
+
+    def __init__(self, mode, options, seed, path=None):
+        # The simulation must have been built as SIMULATIONS[mode](**options,
+        # rng=random.Random(seed)) or reset right after rng.seed(seed)
+        self.mode = mode
+        self.options = options
+        self.seed = seed
+        self.path = path
+        self.ticks = 0
+        self.moves = bytearray()
+        self.count = 0
+
+    def step(self, sim, actions=None):
+        """sim.step(actions), recording the move of every snake that moved"""
+        moving = sim.moving_snakes()
+        sim.step(actions)
+        self.ticks += 1
+
+        for _, snake in moving:
+            shift = 2 * (self.count % 4)
+            if not shift:
+                self.moves.append(0)
+            self.moves[-1] |= DIRECTION_CODES[snake.direction] << shift
+            self.count += 1
+
+        if sim.game_over and self.path:
+            self.save(self.path)
+            self.path = None
+
+    def to_bytes(self):
+        header = json.dumps({"mode": self.mode, "options": self.options, "seed": self.seed,
+                             "ticks": self.ticks, "moves": self.count}).encode()
+        return MAGIC + struct.pack("<BI", VERSION, len(header)) + header + zlib.compress(bytes(self.moves), 9)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+def recorder(mode, options, seed, replay_dir=None):
+    """ReplayWriter for a new game, saving into replay_dir (if given) when the game ends"""
+    path = None
+    if replay_dir:
+        os.makedirs(replay_dir, exist_ok=True)
+        path = os.path.join(replay_dir, f"{mode}-{time.strftime('%Y%m%d-%H%M%S')}-{seed}.snkr")
+    return ReplayWriter(mode, options, seed, path)
+
+
+def snapshot(sim):
+    """Deep copy of a simulation
+
+    Board geometry never changes and flood fill buffers are scratch space
+    rewritten before every use, so the copy shares those with the original
+    instead of duplicating them.
+    """
+    shared = []
+    for part in (sim.ai, sim.human) if isinstance(sim, DualSimulation) else (sim,):
+        shared.append(part.grid)
+        controllers = getattr(part, "ai_controllers", None) or [part.ai_controller]
+        shared += [controller.flood_fill for controller in controllers if controller is not None]
+    return copy.deepcopy(sim, {id(obj): obj for obj in shared if obj is not None})
+
+
+class ReplayPlayer:
+    """Rebuilds a recorded game tick by tick and seeks through it"""
+
+    def __init__(self, data):
+        if data[:4] != MAGIC:
+            raise ValueError("not a snake replay")
+        version, header_size = struct.unpack_from("<BI", data, 4)
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version} (this build plays version {VERSION})")
+
+        start = 4 + struct.calcsize("<BI")
+        header = json.loads(data[start:start + header_size])
+        self.mode = header["mode"]
+        self.options = header["options"]
+        self.seed = header["seed"]
+        self.ticks = header["ticks"]
+        self.moves = zlib.decompress(data[start + header_size:])
+
+        self.sim = SIMULATIONS[self.mode](**self.options, rng=random.Random(self.seed))
+        self.tick = 0
+        self.position = 0  # Index of the next move in the stream
+        self.keyframes = [(0, 0, snapshot(self.sim))]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    @property
+    def finished(self):
+        return self.tick >= self.ticks
+
+    def step(self):
+        """Replay one tick"""
+        if self.finished:
+            return
+
+        actions = {}
+        for key, _ in self.sim.moving_snakes():
+            code = (self.moves[self.position >> 2] >> 2 * (self.position & 3)) & 3
+            actions[key] = DIRECTIONS[code]
+            self.position += 1
+
+        self.sim.step(actions)
+        self.tick += 1
+
+        if self.tick % KEYFRAME_INTERVAL == 0 and self.tick > self.keyframes[-1][0]:
+            self.keyframes.append((self.tick, self.position, snapshot(self.sim)))
+
+    def seek(self, tick):
+        """Move to tick, going back to the nearest keyframe before it when that is closer"""
+        tick = max(0, min(tick, self.ticks))
+        keyframe_tick, position, state = self.keyframes[min(tick // KEYFRAME_INTERVAL, len(self.keyframes) - 1)]
+        if tick < self.tick or keyframe_tick > self.tick:
+            # Snapshots stay untouched so they can be restored again
+            self.sim = snapshot(state)
+            self.tick = keyframe_tick
+            self.position = position
+
+        while self.tick < tick:
+            self.step()
+
+
+def watch(path):
+    """Play a replay file in a window; space pauses, left/right seek, up/down change speed"""
+    import pygame
+    from game import Game
+    from dual_game import DualGame
+    from battle_royale import BattleRoyaleGame
+
+    player = ReplayPlayer.load(path)
+    # Only the modules the viewer uses, like main.py (no audio, joystick, ...)
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((1200, 700))
+    pygame.display.set_caption(f"Snake Game - Replay ({player.mode})")
+
+    if player.mode == "single":
+        view = Game(screen, ai_mode=player.options.get("ai_mode", False))
+    elif player.mode == "dual":
+        view = DualGame(screen)
+    else:
+        view = BattleRoyaleGame(screen)
+
+    clock = pygame.time.Clock()
+    tick_ms = player.sim.tick_ms
+    seek_ticks = int(10000 / tick_ms)  # Ten seconds
+    speed = 1
+    paused = False
+    accumulator = 0
+
+    while True:
+        target = None
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return
+            elif event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_q, pygame.K_ESCAPE):
+                    pygame.quit()
+                    return
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_LEFT:
+                    target = player.tick - seek_ticks
+                elif event.key == pygame.K_RIGHT:
+                    target = player.tick + seek_ticks
+                elif event.key == pygame.K_UP:
+                    speed = min(speed * 2, 64)
+                elif event.key == pygame.K_DOWN:
+                    speed = max(speed // 2, 1)
+
+        elapsed = clock.tick(60)
+        if target is not None:
+            player.seek(target)
+            # The view redraws everything for the restored state
+            view.renderer.clear()
+            view.result_drawn = False
+        elif not paused:
+            accumulator += elapsed * speed
+            while accumulator >= tick_ms and not player.finished:
+                accumulator -= tick_ms
+                player.step()
+            if player.finished:
+                accumulator = 0
+
+        view.sim = player.sim
+        view.draw()
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python src/replay.py REPLAY_FILE")
+    watch(sys.argv[1])
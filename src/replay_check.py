@@ -0,0 +1,103 @@
+import argparse
+import random
+import sys
+from grid import DIRECTIONS
+from simulation import DualSimulation
+from replay import SIMULATIONS, ReplayWriter, ReplayPlayer
+
+# Round-trip check for replays: records seeded games of every mode, saves
+# them to bytes, plays them back and compares the final state, then seeks
+# back and forth to states noted while recording. Replays only work while
+# the simulation is fully deterministic, so run this after any change to
+# simulation.py (and bump replay.VERSION if it changes how games play out):
+#
+#     python src/replay_check.py --games 20
+#
+# The AI plays every snake, so games last, and the human's snake also gets
+# random key presses, reversals included, to cover the action path.
+
+OPTIONS = {
+    "single": dict(cols=60, rows=35, ai_mode=True),
+    "dual": dict(left_cols=29, right_cols=29, rows=35, autopilot=True),
+    "battle_royale": dict(cols=60, rows=35, autopilot=True),
+}
+HUMAN_KEYS = {"single": 0, "dual": 1, "battle_royale": 0}  # Action key of the human's snake
+PRESS_CHANCE = 0.02  # Chance of a key press each tick
+CHECKPOINTS = 6  # States noted per game to seek to
+
+def describe(sim):
+    """Everything a replay has to reproduce, as plain comparable values"""
+    parts = (sim.ai, sim.human) if isinstance(sim, DualSimulation) else (sim,)
+    state = [sim.game_over]
+    for part in parts:
+        snakes = getattr(part, "snakes", None) or [part.snake]
+        state.append([(list(snake.body), snake.direction, snake.alive, snake.cause_of_death) for snake in snakes])
+        foods = getattr(part, "foods", None)
+        state.append(list(foods) if foods is not None else part.food_pos)
+    return state
+
+def record(mode, seed, max_ticks):
+    """Replay bytes of one game plus {tick: describe()} at a few ticks along the way"""
+    rng = random.Random(seed)
+    sim = SIMULATIONS[mode](**OPTIONS[mode], rng=random.Random(seed))
+    writer = ReplayWriter(mode, OPTIONS[mode], seed)
+    checkpoints = set(rng.sample(range(1, max_ticks + 1), CHECKPOINTS))
+    states = {0: describe(sim)}
+
+    while not sim.game_over and writer.ticks < max_ticks:
+        actions = {}
+        if rng.random() < PRESS_CHANCE:
+            actions[HUMAN_KEYS[mode]] = rng.choice(DIRECTIONS)
+        writer.step(sim, actions)
+        if writer.ticks in checkpoints:
+            states[writer.ticks] = describe(sim)
+
+    states[writer.ticks] = describe(sim)
+    return writer.to_bytes(), states
+
+def check(mode, seed, max_ticks):
+    """Problems found replaying one game, empty when it round-trips"""
+    data, states = record(mode, seed, max_ticks)
+    player = ReplayPlayer(data)
+    problems = []
+
+    while not player.finished:
+        player.step()
+    if describe(player.sim) != states[player.tick]:
+        problems.append(f"{mode} seed {seed}: final state differs after {player.tick} ticks")
+
+    # Seek in shuffled order, so both directions and keyframe restores get used
+    ticks = list(states)
+    random.Random(seed).shuffle(ticks)
+    for tick in ticks:
+        player.seek(tick)
+        if describe(player.sim) != states[tick]:
+            problems.append(f"{mode} seed {seed}: state differs after seeking to tick {tick}")
+    return problems, player.ticks
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Record seeded games, replay them and compare the states")
+    parser.add_argument("--games", type=int, default=10, help="games per mode")
+    parser.add_argument("--modes", nargs="+", choices=list(SIMULATIONS), default=list(SIMULATIONS))
+    parser.add_argument("--max-ticks", type=int, default=3000, help="ticks before a game is cut short")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game of each mode")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    failed = False
+    for mode in args.modes:
+        total_ticks = 0
+        problems = []
+        for seed in range(args.seed, args.seed + args.games):
+            game_problems, ticks = check(mode, seed, args.max_ticks)
+            problems += game_problems
+            total_ticks += ticks
+        print(f"{mode}: {args.games} games, {total_ticks} ticks, {'ok' if not problems else 'FAILED'}")
+        for problem in problems:
+            print("  " + problem)
+        failed = failed or bool(problems)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
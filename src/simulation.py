@@ -0,0 +1,531 @@
+import heapq
+import random
+from snake import Snake
+from grid import Grid, OccupancyGrid, CellOwners, FreeCells
+from ai_controller import AIController
+from food_index import FoodIndex, FoodTarget
+from planner import make_planner
+from events import log, DEBUG, INFO
+
+# Pure-Python game state for every mode. Nothing in here touches pygame, so a
+# tick can run on a display-less machine; Game, DualGame and BattleRoyaleGame
+# are views that draw this state and pass keyboard input to step() as actions.
+#
+# Positions are packed cell indices (see grid.Grid); only the views convert
+# them to pixels.
+#
+# All randomness (spawns, food, colors, the AI's last-resort moves) comes
+# from the simulation's rng, a random.Random. Pass one made with a seed and a
+# game plays out the same every time. AI controllers get their own streams
+# split off from it, so a replay that feeds the recorded moves back in
+# without asking the AI still sees the same food.
+
+def split_rng(rng):
+    """Independent random.Random seeded from rng"""
+    return random.Random(rng.getrandbits(64))
+
+class SingleSimulation:
+    tick_ms = 100  # Game runs at 10 ticks per second
+
+    def __init__(self, cols, rows, ai_mode=False, planner="greedy", rng=None):
+        self.grid = Grid(cols, rows)
+        self.ai_mode = ai_mode
+        self.planner = planner  # name from planner.PLANNERS
+        self.rng = rng or random.Random()
+        self.reset()
+
+    def reset(self):
+        """Put the snake back in the middle of the board"""
+        self.game_over = False
+        self.score = 0
+        self.ticks = 0
+
+        # Cells neither the snake nor the food covers, where food can spawn
+        self.free_cells = FreeCells(self.grid)
+
+        start = self.grid.cell(self.grid.cols // 2, self.grid.rows // 2)
+        self.snake = Snake(start, OccupancyGrid(self.grid, self.free_cells))
+
+        # Generate food
+        self.food_pos = self.generate_food()
+
+        # AI controller
+        self.ai_controller = None
+        if self.ai_mode:
+            self.food_target = FoodTarget(self.food_pos)
+            self.ai_controller = AIController(self.snake, self.food_target, planner=make_planner(self.planner),
+                                              rng=split_rng(self.rng))
+
+        log.info("game_started", mode="single", snake=self.grid.coords(start), food=self.grid.coords(self.food_pos))
+
+    @property
+    def elapsed_ms(self):
+        return self.ticks * self.tick_ms
+
+    def generate_food(self):
+        """Place food on a random cell off the snake body; None once the snake fills the board"""
+        food_pos = self.free_cells.choice(self.rng)
+        if food_pos is not None:
+            self.free_cells.occupy(food_pos)
+            if log.level <= DEBUG:
+                log.debug("food_spawned", tick=self.ticks, cell=self.grid.coords(food_pos))
+        return food_pos
+
+    def moving_snakes(self):
+        """(action key, snake) for each snake that moves on the next step"""
+        return [] if self.game_over else [(0, self.snake)]
+
+    def step(self, actions=None):
+        """Advance one tick
+
+        actions maps a snake index (always 0 here) to a direction; in AI mode
+        the controller decides when no action is given.
+        """
+        if self.game_over:
+            return
+
+        self.ticks += 1
+        direction = actions.get(0) if actions else None
+
+        # AI control
+        if direction is None and self.ai_controller:
+            # Update AI food target
+            self.food_target.position = self.food_pos
+            direction = self.ai_controller.get_next_direction()
+
+        if direction is not None:
+            self.snake.change_direction(direction[0], direction[1])
+
+        # Move snake
+        self.snake.move()
+
+        # Check food collision
+        head = self.snake.get_head()
+        if head == self.food_pos:
+            self.snake.grow()
+            self.score += 10
+            self.free_cells.vacate(head)
+            if log.level <= INFO:
+                log.info("food_eaten", tick=self.ticks, cell=self.grid.coords(head), score=self.score,
+                         length=len(self.snake))
+            self.food_pos = self.generate_food()
+            if self.food_pos is None:
+                # The snake covers the whole board, nothing is left to eat
+                self.end_game()
+
+        # Check boundary collision (the head is -1 once it leaves the board)
+        if head < 0:
+            self.snake.cause_of_death = "wall"
+            self.end_game()
+
+        # Check self collision
+        elif self.snake.check_collision():
+            self.snake.cause_of_death = "self"
+            self.end_game()
+
+    def end_game(self):
+        """End the game"""
+        self.game_over = True
+        log.info("game_over", tick=self.ticks, score=self.score, length=len(self.snake),
+                 cause=self.snake.cause_of_death)
+
+
+class DualSimulation:
+    tick_ms = 125  # DualGame runs at 8 ticks per second
+
+    def __init__(self, left_cols, right_cols, rows, planner="greedy", autopilot=False, rng=None):
+        # Each side is an independent board in its own coordinates; the AI
+        # plays the left one and the human the right one
+        self.left_cols = left_cols
+        self.right_cols = right_cols
+        self.rows = rows
+        self.planner = planner
+        self.autopilot = autopilot  # AI also plays the human side (headless runs)
+        self.rng = rng or random.Random()  # Shared by both boards, which always step in the same order
+        self.reset()
+
+    def reset(self):
+        """Start a new match on both boards"""
+        self.ai = SingleSimulation(self.left_cols, self.rows, ai_mode=True, planner=self.planner, rng=self.rng)
+        self.human = SingleSimulation(self.right_cols, self.rows, ai_mode=self.autopilot, planner=self.planner,
+                                      rng=self.rng)
+        self.game_over = False
+        self.winner = None
+        self.ticks = 0
+
+    @property
+    def elapsed_ms(self):
+        return self.ticks * self.tick_ms
+
+    @property
+    def ai_alive(self):
+        return not self.ai.game_over
+
+    @property
+    def human_alive(self):
+        return not self.human.game_over
+
+    def moving_snakes(self):
+        """(action key, snake) for each snake that moves on the next step"""
+        return [] if self.game_over else [(0, self.ai.snake), (1, self.human.snake)]
+
+    def step(self, actions=None):
+        """Advance both boards one tick
+
+        actions maps 0 (AI side) and 1 (human side) to directions.
+        """
+        if self.game_over:
+            return
+
+        self.ticks += 1
+        actions = actions or {}
+        self.ai.step({0: actions.get(0)})
+        self.human.step({0: actions.get(1)})
+
+        # Check if game is over
+        if not self.ai_alive or not self.human_alive:
+            self.end_game()
+
+    def end_game(self):
+        """End game and determine winner"""
+        self.game_over = True
+
+        if not self.ai_alive and not self.human_alive:
+            # Tie, compare scores
+            if self.ai.score > self.human.score:
+                self.winner = "AI"
+            elif self.human.score > self.ai.score:
+                self.winner = "Human"
+            else:
+                self.winner = "Tie"
+        elif not self.ai_alive:
+            self.winner = "Human"
+        elif not self.human_alive:
+            self.winner = "AI"
+
+        log.info("game_over", tick=self.ticks, winner=self.winner, ai_score=self.ai.score,
+                 human_score=self.human.score)
+
+
+class BattleRoyaleSimulation:
+    tick_ms = 1000 / 30  # One frame of the 30 FPS battle royale loop
+
+    def __init__(self, cols, rows, snake_count=25, planner="greedy", autopilot=False, rng=None):
+        self.grid = Grid(cols, rows)
+        self.rng = rng or random.Random()
+        self.snake_count = snake_count
+        self.planner = planner
+        self.human_snake_index = 0
+        self.autopilot = autopilot  # The human's snake follows its backup AI controller (headless runs)
+
+        # Boundary shrinking system
+        self.shrink_interval = 60000  # 60 seconds = 60000ms
+        self.shrink_amount = 2  # Shrink by 2 cells each time (one per side)
+        self.min_safe_zone = 10  # Stop shrinking at 10 cells across
+
+        self.reset()
+
+    def reset(self):
+        """Reset safe zone and clocks, then spawn a fresh set of snakes"""
+        self.game_over = False
+        self.human_eliminated = False
+        self.winner = None
+        self.frame_count = 0
+        # Safe zone rectangle, in cells
+        self.safe_zone_width = self.grid.cols
+        self.safe_zone_height = self.grid.rows
+        self.safe_zone_x = 0
+        self.safe_zone_y = 0
+        self.safe_mask = self.grid.mask(self.safe_zone_bounds)
+        self.shrink_timer = 0
+        self.foods = FoodIndex(self.grid)
+        # Safe-zone cells no living snake or food covers, where food can spawn
+        self.free_cells = FreeCells(self.grid, self.safe_mask)
+        # Living snake covering each cell; owner ids are snake indices
+        self.cell_owners = CellOwners(self.grid)
+        self.init_game()
+
+    @property
+    def elapsed_ms(self):
+        return int(self.frame_count * self.tick_ms)
+
+    @property
+    def next_shrink_ms(self):
+        return max(0, self.shrink_interval - (self.elapsed_ms - self.shrink_timer))
+
+    @property
+    def safe_zone_bounds(self):
+        return (self.safe_zone_x, self.safe_zone_y,
+                self.safe_zone_x + self.safe_zone_width, self.safe_zone_y + self.safe_zone_height)
+
+    @property
+    def human_snake(self):
+        return self.snakes[self.human_snake_index]
+
+    def init_game(self):
+        """Initialize snakes and AI controllers"""
+        self.snakes = []
+        self.ai_controllers = []
+        self.human_eliminated = False
+
+        for i in range(self.snake_count):
+            # Random position, ensure within boundaries
+            x = self.rng.randint(2, self.grid.cols - 3)
+            y = self.rng.randint(2, self.grid.rows - 3)
+
+            snake = Snake(self.grid.cell(x, y), OccupancyGrid(self.grid, self.free_cells, self.cell_owners))
+
+            # Random color
+            snake.color = (self.rng.randint(50, 255), self.rng.randint(50, 255), self.rng.randint(50, 255))
+            self.snakes.append(snake)
+
+            # Create AI controller for each snake (including human-controlled snake as backup)
+            ai_controller = AIController(snake, FoodTarget(), board_occupancy=self.cell_owners.counts,
+                                         planner=make_planner(self.planner), rng=split_rng(self.rng))
+            self.ai_controllers.append(ai_controller)
+
+        # Move schedule: a heap of (frame of the next move, snake index), so
+        # a frame only looks at the snakes that move in it. Everyone moves on
+        # the first frame
+        self.schedule = [(0, i) for i in range(len(self.snakes))]
+
+        # First snake controlled by human
+        self.snakes[self.human_snake_index].color = (0, 255, 255)  # Cyan to identify human snake
+
+        # Generate initial food
+        self.generate_foods()
+
+        log.info("game_started", mode="battle_royale", snakes=len(self.snakes))
+
+    def generate_foods(self):
+        """Generate random number of foods"""
+        for food_pos in self.foods:
+            self.free_cells.vacate(food_pos)
+        self.foods.clear()
+        food_count = self.rng.randint(3, 8)  # 3-8 foods
+
+        for _ in range(food_count):
+            # Free cells are inside the safe zone and off every living snake
+            food_pos = self.free_cells.choice(self.rng)
+            if food_pos is None:
+                break
+            self.free_cells.occupy(food_pos)
+            self.foods.add(food_pos)
+
+        if log.level <= DEBUG:
+            log.debug("foods_spawned", tick=self.frame_count, count=len(self.foods))
+
+    def get_snake_speed(self, snake_length):
+        """Calculate speed based on snake length (longer snakes are slower)"""
+        # Length 1-5: Speed 25-21
+        # Length 6-10: Speed 20-16
+        # Length 11+: Speed 15-5 (minimum 5)
+        base_speed = max(5, 30 - snake_length)
+        return min(25, base_speed)
+
+    def get_move_interval(self, snake_length):
+        """Frames between two moves of a snake of this length"""
+        return max(1, 30 - self.get_snake_speed(snake_length))
+
+    def step(self, actions=None):
+        """Advance one frame
+
+        actions maps snake indices to directions; snakes without an action
+        keep their heading (human) or ask their AI controller.
+        """
+        if self.game_over:
+            return
+
+        actions = actions or {}
+        human_snake = self.human_snake
+
+        # Check if human player died
+        if not human_snake.alive and not self.human_eliminated:
+            self.human_eliminated = True
+            self.end_game_human_eliminated()
+
+        # Check boundary shrinking
+        if self.elapsed_ms - self.shrink_timer >= self.shrink_interval:
+            self.shrink_safe_zone()
+            self.shrink_timer = self.elapsed_ms
+
+        # Update snakes at different speeds based on their length
+        moving = [i for i, _ in self.moving_snakes()]
+
+        for i in moving:
+            self.update_snake(i, actions.get(i))
+        self.reschedule()
+
+        # Periodically regenerate food
+        if len(self.foods) < 2:
+            self.generate_foods()
+
+        # Check game end conditions; snakes only die when one moves
+        if moving and not self.human_eliminated:
+            alive_ai_snakes = [s for i, s in enumerate(self.snakes)
+                               if i != self.human_snake_index and s.alive]
+            if len(alive_ai_snakes) == 0 and human_snake.alive:
+                # Human wins
+                self.end_game_human_win()
+            elif len(alive_ai_snakes) <= 1 and not human_snake.alive:
+                # AI wins or no winner
+                self.end_game()
+
+        self.frame_count += 1
+
+    def moving_snakes(self):
+        """(index, snake) for each snake that moves on the next step"""
+        if self.game_over:
+            return []
+
+        # Every entry due by now sits in the subtree of due entries below
+        # the root, so this walks only those without popping them
+        schedule = self.schedule
+        due = []
+        pending = [0] if schedule else []
+        while pending:
+            k = pending.pop()
+            frame, i = schedule[k]
+            if frame <= self.frame_count:
+                if self.snakes[i].alive:
+                    due.append(i)
+                pending.extend(child for child in (2 * k + 1, 2 * k + 2) if child < len(schedule))
+
+        # Snakes move in index order, as they always have
+        due.sort()
+        return [(i, self.snakes[i]) for i in due]
+
+    def reschedule(self):
+        """Take the snakes that were due off the schedule and book their next move"""
+        # Each moved snake waits for the interval of its length after the
+        # move, so eating slows it down from its very next move; dead snakes
+        # just drop off the schedule
+        schedule = self.schedule
+        while schedule and schedule[0][0] <= self.frame_count:
+            _, i = heapq.heappop(schedule)
+            snake = self.snakes[i]
+            if snake.alive:
+                heapq.heappush(schedule, (self.frame_count + self.get_move_interval(len(snake)), i))
+
+    def is_ai(self, snake_index):
+        """Whether the snake is steered by its AI controller"""
+        return self.autopilot or snake_index != self.human_snake_index
+
+    def update_snake(self, snake_index, direction=None):
+        """Update single snake"""
+        snake = self.snakes[snake_index]
+        if not snake.alive:
+            return
+
+        # Human control vs AI control
+        if direction is None and self.is_ai(snake_index):
+            # AI control
+            ai_controller = self.ai_controllers[snake_index]
+            # Update AI target (nearest food or smaller snake)
+            self.update_ai_target(ai_controller, snake)
+            direction = ai_controller.get_next_direction()
+
+        if direction is not None:
+            snake.change_direction(direction[0], direction[1])
+
+        # Move snake
+        snake.move()
+
+        # Check food collision
+        head = snake.get_head()
+        if head in self.foods:
+            snake.grow()
+            self.foods.remove(head)
+            self.free_cells.vacate(head)
+            if log.level <= INFO:
+                log.info("food_eaten", tick=self.frame_count, snake=snake_index, cell=self.grid.coords(head),
+                         length=len(snake))
+
+        # Check snake-to-snake collision (big snake eats small snake); the
+        # cell still belongs to the snake that was there before the head
+        i = self.cell_owners.owner(head)
+        if i >= 0 and i != snake_index:
+            other_snake = self.snakes[i]
+            if len(snake) > len(other_snake):
+                # Big snake eats small snake
+                snake.grow()
+                other_snake.alive = False
+                other_snake.cause_of_death = "eaten"
+                other_snake.occupancy.detach()
+                if log.level <= INFO:
+                    log.info("snake_died", tick=self.frame_count, snake=i, cause="eaten", by=snake_index,
+                             length=len(other_snake), human=i == self.human_snake_index)
+            else:
+                # Small snake dies hitting big snake
+                snake.alive = False
+                snake.cause_of_death = "snake"
+                snake.occupancy.detach()
+                if log.level <= INFO:
+                    log.info("snake_died", tick=self.frame_count, snake=snake_index, cause="snake", by=i,
+                             length=len(snake), human=snake_index == self.human_snake_index)
+                return
+
+        # Check boundary and self collision
+        if head < 0:
+            snake.cause_of_death = "wall"
+        elif not self.safe_mask[head]:
+            snake.cause_of_death = "zone"
+        elif snake.check_collision():
+            snake.cause_of_death = "self"
+
+        if snake.cause_of_death:
+            snake.alive = False
+            snake.occupancy.detach()
+            if log.level <= INFO:
+                log.info("snake_died", tick=self.frame_count, snake=snake_index, cause=snake.cause_of_death,
+                         length=len(snake), human=snake_index == self.human_snake_index)
+
+    def update_ai_target(self, ai_controller, snake):
+        """Update AI target"""
+        # Head for the nearest food
+        if self.foods:
+            ai_controller.food.position = self.foods.nearest(snake.get_head())
+
+        # Update safe zone info
+        ai_controller.set_bounds(self.safe_zone_bounds)
+
+    def shrink_safe_zone(self):
+        """Shrink safe zone"""
+        if self.safe_zone_width > self.min_safe_zone and self.safe_zone_height > self.min_safe_zone:
+            self.safe_zone_width -= self.shrink_amount
+            self.safe_zone_height -= self.shrink_amount
+            self.safe_zone_x += self.shrink_amount // 2
+            self.safe_zone_y += self.shrink_amount // 2
+            self.safe_mask = self.grid.mask(self.safe_zone_bounds)
+            self.free_cells.set_inside(self.safe_mask)
+
+            log.info("zone_shrunk", tick=self.frame_count, bounds=self.safe_zone_bounds)
+
+            # Regenerate food
+            self.generate_foods()
+
+    def end_game_human_eliminated(self):
+        """Human eliminated, game over"""
+        self.game_over = True
+        self.winner = "You were eliminated!"
+        log.info("game_over", tick=self.frame_count, winner=self.winner)
+
+    def end_game_human_win(self):
+        """Human wins"""
+        self.game_over = True
+        self.winner = "Human"
+        log.info("game_over", tick=self.frame_count, winner=self.winner)
+
+    def end_game(self):
+        """Regular game end"""
+        self.game_over = True
+        alive_snakes = [(i, s) for i, s in enumerate(self.snakes)
+                        if s.alive and i != self.human_snake_index]
+
+        if alive_snakes:
+            winner_index, winner_snake = alive_snakes[0]
+            self.winner = f"AI Snake {winner_index}"
+        else:
+            self.winner = "No Winner"
+
+        log.info("game_over", tick=self.frame_count, winner=self.winner)
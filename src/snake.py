@@ -1,29 +1,51 @@
-import pygame
+from collections import deque
 
 class Snake:
-    def __init__(self, x, y, cell_size):
-        self.body = [(x, y)]
+    def __init__(self, cell, occupancy):
+        # Packed cell indices (see grid.Grid), head at the left end and tail
+        # at the right, so both move in O(1)
+        self.body = deque([cell])
         self.direction = (1, 0)
-        self.cell_size = cell_size
         self.color = (0, 255, 0)
         self.alive = True
+        self.cause_of_death = None  # Set by the simulation: "wall", "self", "zone", "snake" or "eaten"
+        
+        # Segments still owed from grow(); the tail stays put while this is
+        # positive instead of a duplicate tail being appended
+        self.growth = 0
+        
+        # Steps taken so far; lets a view work out which cells changed since
+        # it last drew the snake, however many ticks ago that was
+        self.moves = 0
+        
+        # Occupancy grid kept in step with body so membership tests are O(1)
+        self.occupancy = occupancy
+        self.grid = occupancy.grid
+        self.occupancy.add(cell)
+        
+    def __len__(self):
+        return len(self.body) + self.growth
         
     def move(self):
         if not self.alive:
             return
             
-        head_x, head_y = self.body[0]
-        new_head = (head_x + self.direction[0] * self.cell_size, 
-                   head_y + self.direction[1] * self.cell_size)
-        self.body.insert(0, new_head)
-        self.body.pop()
+        # -1 when the head leaves the board; the game sees that and ends
+        new_head = self.grid.neighbors[self.direction][self.body[0]]
+        self.body.appendleft(new_head)
+        self.occupancy.add(new_head)
+        self.moves += 1
+        
+        if self.growth:
+            self.growth -= 1
+        else:
+            self.occupancy.remove(self.body.pop())
         
     def grow(self):
         if not self.alive:
             return
             
-        tail = self.body[-1]
-        self.body.append(tail)
+        self.growth += 1
         
     def change_direction(self, dx, dy):
         if not self.alive:
@@ -35,15 +57,10 @@ class Snake:
     def get_head(self):
         return self.body[0]
         
-    def check_collision(self):
-        head = self.get_head()
-        return head in self.body[1:]
+    def occupies(self, cell):
+        return self.occupancy.is_occupied(cell)
         
-    def draw(self, screen):
-        if not self.alive:
-            return
-            
-        for segment in self.body:
-            rect = pygame.Rect(segment[0], segment[1], self.cell_size, self.cell_size)
-            pygame.draw.rect(screen, self.color, rect)
-            pygame.draw.rect(screen, (255, 255, 255), rect, 1)
\ No newline at end of file
+    def check_collision(self):
+        # The head accounts for one count in its cell; any other count is a
+        # body segment sharing it
+        return self.occupancy.count(self.get_head()) > 1
\ No newline at end of file
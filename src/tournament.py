@@ -0,0 +1,115 @@
+import argparse
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from simulation import SingleSimulation, DualSimulation, BattleRoyaleSimulation
+from planner import PLANNERS
+
+# Headless tournament: plays many seeded games of each mode on every core
+# and sums up how the AI did, so a change to AIController can be scored on
+# thousands of games instead of watched one at a time. Run it like main.py:
+#
+#     python src/tournament.py --games 10000 --modes single battle_royale
+#
+# Boards have the size the game window gives them (1200x700, 20px cells).
+# The human's snake in dual and battle royale mode is played by the AI.
+
+COLS, ROWS = 60, 35
+DUAL_COLS = 29  # Each half of the dual-mode screen, minus the divider
+MODES = ["single", "dual", "battle_royale"]
+
+def play_single(rng, planner, max_ticks):
+    sim = SingleSimulation(COLS, ROWS, ai_mode=True, planner=planner, rng=rng)
+    while not sim.game_over and sim.ticks < max_ticks:
+        sim.step()
+    return result(sim.score, sim.snake, sim.ticks)
+
+def play_dual(rng, planner, max_ticks):
+    sim = DualSimulation(DUAL_COLS, DUAL_COLS, ROWS, planner=planner, autopilot=True, rng=rng)
+    while not sim.game_over and sim.ticks < max_ticks:
+        sim.step()
+    # Scored from the AI side; the winner shows how it fared against its copy
+    return result(sim.ai.score, sim.ai.snake, sim.ticks, sim.winner)
+
+def play_battle_royale(rng, planner, max_ticks):
+    sim = BattleRoyaleSimulation(COLS, ROWS, planner=planner, autopilot=True, rng=rng)
+    while not sim.game_over and sim.frame_count < max_ticks:
+        sim.step()
+    # The human's slot stands in for a single AI player; the game ends with it
+    snake = sim.human_snake
+    return result(len(snake), snake, sim.frame_count, sim.winner)
+
+GAMES = {
+    "single": play_single,
+    "dual": play_dual,
+    "battle_royale": play_battle_royale,
+}
+
+def result(score, snake, ticks, winner=None):
+    return {
+        "score": score,
+        "length": len(snake),
+        "ticks": ticks,
+        "cause": snake.cause_of_death or "survived",  # Still alive at the end
+        "winner": winner,
+    }
+
+def play(job):
+    """Play one game in a worker process; job is (mode, seed, planner, max_ticks)"""
+    mode, seed, planner, max_ticks = job
+    outcome = GAMES[mode](random.Random(seed), planner, max_ticks)
+    outcome["mode"] = mode
+    outcome["seed"] = seed
+    return outcome
+
+def run_tournament(modes, games, planner="greedy", max_ticks=20000, seed=0, workers=None):
+    """Results of games seeded seed, seed + 1, ... for each mode, played in parallel"""
+    jobs = [(mode, seed + n, planner, max_ticks) for mode in modes for n in range(games)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(play, jobs, chunksize=8))
+
+def summarize(results):
+    """Per-mode summary lines for a list of game results"""
+    lines = []
+    for mode in MODES:
+        games = [r for r in results if r["mode"] == mode]
+        if not games:
+            continue
+
+        scores = sorted(r["score"] for r in games)
+        count = len(games)
+        lines.append(f"{mode}: {count} games")
+        lines.append(f"  score   mean {sum(scores) / count:.1f}  median {scores[count // 2]}  "
+                     f"min {scores[0]}  max {scores[-1]}")
+        lines.append(f"  length  mean {sum(r['length'] for r in games) / count:.1f}")
+        lines.append(f"  ticks   mean {sum(r['ticks'] for r in games) / count:.1f}")
+
+        causes = Counter(r["cause"] for r in games)
+        lines.append("  end     " + "  ".join(f"{cause} {n / count:.1%}" for cause, n in causes.most_common()))
+
+        winners = Counter(r["winner"] for r in games if r["winner"] is not None)
+        if winners:
+            lines.append("  winner  " + "  ".join(f"{winner} {n / count:.1%}" for winner, n in winners.most_common(5)))
+    return lines
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Play seeded headless games on every core and summarize them")
+    parser.add_argument("--games", type=int, default=1000, help="games per mode")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--planner", choices=list(PLANNERS), default="greedy")
+    parser.add_argument("--max-ticks", type=int, default=20000, help="ticks before a game is called off")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game of each mode")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    start = time.perf_counter()
+    results = run_tournament(args.modes, args.games, args.planner, args.max_ticks, args.seed, args.workers)
+    for line in summarize(results):
+        print(line)
+    print(f"{len(results)} games in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
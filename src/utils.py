@@ -1,10 +1,77 @@
-def draw_snake(surface, snake_body, block_size):
-    for block in snake_body:
-        pygame.draw.rect(surface, (0, 255, 0), (block[0], block[1], block_size, block_size))
+from collections import OrderedDict
+import pygame
 
-def draw_food(surface, food_position, block_size):
-    pygame.draw.rect(surface, (255, 0, 0), (food_position[0], food_position[1], block_size, block_size))
+# Simulation positions are packed cells (y * cols + x); these helpers are the
+# only place they become pixels.
+
+def cell_rect(cell, cols, block_size):
+    y, x = divmod(cell, cols)
+    return pygame.Rect(x * block_size, y * block_size, block_size, block_size)
+
+# (color, block_size) -> pre-rendered block, shared by every view
+block_tiles = {}
+
+def block_tile(color, block_size):
+    """A block (fill plus white border) rendered once per color and size"""
+    key = (color, block_size)
+    tile = block_tiles.get(key)
+    if tile is None:
+        tile = pygame.Surface((block_size, block_size))
+        rect = tile.get_rect()
+        pygame.draw.rect(tile, color, rect)
+        pygame.draw.rect(tile, (255, 255, 255), rect, 1)
+        block_tiles[key] = tile
+    return tile
+
+# (path, size) -> loaded font, shared by the menu and every mode
+fonts = {}
+
+def get_font(size, path=None):
+    """Font from path (None for pygame's default) at size, loaded once per process"""
+    key = (path, size)
+    font = fonts.get(key)
+    if font is None:
+        try:
+            font = pygame.font.Font(path, size)
+        except (OSError, pygame.error):
+            if path is None:
+                raise
+            # Unreadable font file, use the default font at this size instead
+            font = get_font(size)
+        fonts[key] = font
+    return font
+
+# (font, text, color) -> rendered text, least recently used first
+text_cache = OrderedDict()
+TEXT_CACHE_SIZE = 256
+
+def render_text(font, text, color):
+    """Antialiased font.render, reusing the surface when the same text was drawn recently"""
+    key = (font, text, color)
+    surface = text_cache.get(key)
+    if surface is None:
+        surface = font.render(text, True, color)
+        text_cache[key] = surface
+        if len(text_cache) > TEXT_CACHE_SIZE:
+            text_cache.popitem(last=False)
+    else:
+        text_cache.move_to_end(key)
+    return surface
+
+# (size, color, alpha) -> translucent full-area fill, e.g. behind result screens
+overlay_surfaces = {}
+
+def overlay_surface(size, color, alpha):
+    """A translucent surface of one color, created once per size, color and alpha"""
+    key = (size, color, alpha)
+    overlay = overlay_surfaces.get(key)
+    if overlay is None:
+        overlay = pygame.Surface(size)
+        overlay.set_alpha(alpha)
+        overlay.fill(color)
+        overlay_surfaces[key] = overlay
+    return overlay
 
 def display_score(surface, score, font, color, position):
-    score_surface = font.render(f'Score: {score}', True, color)
+    score_surface = render_text(font, f'Score: {score}', color)
     surface.blit(score_surface, position)
\ No newline at end of file